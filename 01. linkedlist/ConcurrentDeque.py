@@ -0,0 +1,339 @@
+"""
+A thread-safe doubly linked deque with one lock per end.
+
+Operations at the head take only the head lock and operations at the tail only
+the tail lock, so a producer at one end does not block a consumer at the other.
+The two ends only touch the same nodes when the deque is nearly empty; below
+FAST_PATH_MIN elements an operation takes both locks (head first, then tail).
+
+The size is kept as four counters, each written only under its own end's lock.
+A reader at one end may miss the single operation in flight at the other end,
+so the estimate it computes is at most one element too high, which is why the
+fast path needs a few elements of slack.
+
+@author me
+"""
+import threading
+import time
+
+class ConcurrentDeque:
+
+    # Below this many elements (as seen from one end) both locks are taken
+    FAST_PATH_MIN = 4
+
+    class Node:
+        def __init__(self, data, prev=None, next=None):
+            self.data = data
+            self.prev = prev
+            self.next = next
+
+        def __str__(self):
+            return f"{self.data}"
+
+
+    def __init__(self, data=None): # data is iterable
+        # Sentinels so that no operation has to special-case an empty deque
+        self.head = self.Node(None)
+        self.tail = self.Node(None, self.head)
+        self.head.next = self.tail
+
+        self.head_lock = threading.Lock()
+        self.tail_lock = threading.Lock()
+
+        # Elements added and removed at each end, written under that end's lock
+        self.head_added = self.head_removed = 0
+        self.tail_added = self.tail_removed = 0
+
+        # Contention: how often a lock was already held, and how often both were needed
+        self.head_contended = 0
+        self.tail_contended = 0
+        self.slow_path = 0
+
+        # Blocked takers sleep here; pushers only notify when someone is waiting
+        self.not_empty = threading.Condition(threading.Lock())
+        self.waiters = 0
+
+        if data is not None:
+            for elem in data: self.addLast(elem)
+
+    # Number of elements; exact when the deque is quiescent
+    def sz(self) -> int:
+        added = self.head_added + self.tail_added
+        return added - self.head_removed - self.tail_removed
+
+    def isEmpty(self) -> bool:
+        return self.sz() <= 0
+
+    def __len__(self) -> int:
+        return max(0, self.sz())
+
+
+    # Acquire a lock, counting the acquisition as contended if we had to wait
+    def acquire(self, lock, at_head: bool):
+        if lock.acquire(blocking=False): return
+        lock.acquire()
+        if at_head: self.head_contended += 1
+        else: self.tail_contended += 1
+
+    # Size as seen from the head, with the head lock held; at most one too high
+    def sizeFromHead(self) -> int:
+        # Read 'added' before 'removed' so late pushes can only make this smaller
+        tail_added = self.tail_added
+        return self.head_added - self.head_removed + tail_added - self.tail_removed
+
+    # Size as seen from the tail, with the tail lock held; at most one too high
+    def sizeFromTail(self) -> int:
+        head_added = self.head_added
+        return self.tail_added - self.tail_removed + head_added - self.head_removed
+
+    # Take the head lock, plus the tail lock when the deque is small.
+    # Returns whether both locks are held.
+    def lockHead(self) -> bool:
+        self.acquire(self.head_lock, True)
+        if self.sizeFromHead() >= self.FAST_PATH_MIN: return False
+        self.acquire(self.tail_lock, False)
+        self.slow_path += 1
+        return True
+
+    def unlockHead(self, both: bool):
+        if both: self.tail_lock.release()
+        self.head_lock.release()
+
+    # Take the tail lock, or both locks (head first) when the deque is small.
+    # Returns whether both locks are held.
+    def lockTail(self) -> bool:
+        self.acquire(self.tail_lock, False)
+        if self.sizeFromTail() >= self.FAST_PATH_MIN: return False
+        # Keep the lock order head -> tail
+        self.tail_lock.release()
+        self.acquire(self.head_lock, True)
+        self.acquire(self.tail_lock, False)
+        self.slow_path += 1
+        return True
+
+    def unlockTail(self, both: bool):
+        self.tail_lock.release()
+        if both: self.head_lock.release()
+
+    def signal(self):
+        if self.waiters:
+            with self.not_empty: self.not_empty.notify()
+
+
+    # Add an element to the head, O(1)
+    def addFirst(self, elem):
+        both = self.lockHead()
+        try:
+            first = self.head.next
+            node = self.Node(elem, self.head, first)
+            first.prev = node
+            self.head.next = node
+            self.head_added += 1
+        finally:
+            self.unlockHead(both)
+        self.signal()
+
+    # Add an element to the tail, O(1)
+    def addLast(self, elem):
+        both = self.lockTail()
+        try:
+            last = self.tail.prev
+            node = self.Node(elem, last, self.tail)
+            last.next = node
+            self.tail.prev = node
+            self.tail_added += 1
+        finally:
+            self.unlockTail(both)
+        self.signal()
+
+    def add(self, elem):
+        self.addLast(elem)
+
+    # Remove from the head, or return 'default' if empty, O(1)
+    def pollFirstOr(self, default):
+        both = self.lockHead()
+        try:
+            node = self.head.next
+            if node is self.tail: return default
+            self.head.next = node.next
+            node.next.prev = self.head
+            self.head_removed += 1
+            return node.data
+        finally:
+            self.unlockHead(both)
+
+    # Remove from the tail, or return 'default' if empty, O(1)
+    def pollLastOr(self, default):
+        both = self.lockTail()
+        try:
+            node = self.tail.prev
+            if node is self.head: return default
+            self.tail.prev = node.prev
+            node.prev.next = self.tail
+            self.tail_removed += 1
+            return node.data
+        finally:
+            self.unlockTail(both)
+
+    # Remove the first element, raising if empty, O(1)
+    def removeFirst(self):
+        data = self.pollFirstOr(self.head)
+        if data is self.head: raise Exception('Empty list')
+        return data
+
+    # Remove the last element, raising if empty, O(1)
+    def removeLast(self):
+        data = self.pollLastOr(self.head)
+        if data is self.head: raise Exception('Empty list')
+        return data
+
+    # Block until an element can be removed; 'timeout' is in seconds (None waits forever)
+    def take(self, poll, timeout):
+        data = poll(self.head)
+        if data is not self.head: return data
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.not_empty:
+            self.waiters += 1
+            try:
+                while True:
+                    data = poll(self.head)
+                    if data is not self.head: return data
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError('Timed out waiting for an element')
+                    self.not_empty.wait(remaining)
+            finally:
+                self.waiters -= 1
+
+    # Remove the first element, waiting up to 'timeout' seconds for one to arrive
+    def takeFirst(self, timeout=None):
+        return self.take(self.pollFirstOr, timeout)
+
+    # Remove the last element, waiting up to 'timeout' seconds for one to arrive
+    def takeLast(self, timeout=None):
+        return self.take(self.pollLastOr, timeout)
+
+    def peekFirst(self):
+        both = self.lockHead()
+        try:
+            if self.head.next is self.tail: raise Exception('Empty list')
+            return self.head.next.data
+        finally:
+            self.unlockHead(both)
+
+    def peekLast(self):
+        both = self.lockTail()
+        try:
+            if self.tail.prev is self.head: raise Exception('Empty list')
+            return self.tail.prev.data
+        finally:
+            self.unlockTail(both)
+
+    # Contention counters as a plain dict
+    def stats(self) -> dict:
+        return {
+            'size': len(self),
+            'head_contended': self.head_contended,
+            'tail_contended': self.tail_contended,
+            'slow_path': self.slow_path,
+        }
+
+    # Snapshot of the values, taken with both locks held
+    def __str__(self):
+        with self.head_lock, self.tail_lock:
+            values = []
+            trav = self.head.next
+            while trav is not self.tail:
+                values.append(str(trav.data))
+                trav = trav.next
+        return '[' + ', '.join(values) + ']'
+
+
+# testing
+def main():
+    dq = ConcurrentDeque([1, 2, 3])
+    print(dq, dq.sz(), dq.isEmpty())
+    dq.addFirst(0)
+    dq.addLast(4)
+    print(dq, 'peek', dq.peekFirst(), dq.peekLast())
+    print(dq.removeFirst(), dq.removeLast(), dq)
+
+    # A taker blocks until a producer delivers
+    def producer():
+        time.sleep(0.05)
+        dq.addLast('late')
+    while not dq.isEmpty(): dq.removeFirst()
+    threading.Thread(target=producer).start()
+    print('took', dq.takeLast(timeout=1))
+    try:
+        dq.takeFirst(timeout=0.05)
+    except TimeoutError as e:
+        print('timeout:', e)
+
+    # Producers at the tail and consumers at the head
+    dq = ConcurrentDeque()
+    n, threads = 20_000, 4
+    taken = []
+    def produce(base):
+        for i in range(n): dq.addLast(base + i)
+    def consume():
+        for _ in range(n): taken.append(dq.takeFirst(timeout=5))
+    workers = [threading.Thread(target=produce, args=(k * n,)) for k in range(threads)]
+    workers += [threading.Thread(target=consume) for _ in range(threads)]
+    for w in workers: w.start()
+    for w in workers: w.join()
+    print('all delivered once?', sorted(taken) == list(range(threads * n)), 'empty?', dq.isEmpty())
+    print(dq.stats())
+
+
+# benchmark: producers and consumers at opposite ends vs one coarse lock
+def benchmark(n: int = 100_000, pairs=(1, 2, 4)):
+    from DoublyLinkedList import DoublyLinkedList
+
+    class CoarseDeque:
+        def __init__(self):
+            self.ls = DoublyLinkedList()
+            self.lock = threading.Lock()
+            self.contended = 0
+        def addLast(self, elem):
+            if not self.lock.acquire(blocking=False):
+                self.lock.acquire()
+                self.contended += 1
+            try: self.ls.addLast(elem)
+            finally: self.lock.release()
+        def pollFirstOr(self, default):
+            if not self.lock.acquire(blocking=False):
+                self.lock.acquire()
+                self.contended += 1
+            try: return self.ls.removeFirst() if self.ls.size_of_list else default
+            finally: self.lock.release()
+
+    def run(dq, k):
+        per = n // k
+        def produce():
+            for i in range(per): dq.addLast(i)
+        def consume():
+            got = 0
+            while got < per:
+                if dq.pollFirstOr(None) is not None: got += 1
+        workers = [threading.Thread(target=produce) for _ in range(k)]
+        workers += [threading.Thread(target=consume) for _ in range(k)]
+        start = time.perf_counter()
+        for w in workers: w.start()
+        for w in workers: w.join()
+        return 2 * per * k / (time.perf_counter() - start)
+
+    print(f"{'pairs':>6}{'coarse ops/s':>15}{'contended':>11}{'two-lock ops/s':>16}{'contended':>11}{'slow path':>11}")
+    for k in pairs:
+        coarse = CoarseDeque()
+        coarse_rate = run(coarse, k)
+        dq = ConcurrentDeque()
+        rate = run(dq, k)
+        s = dq.stats()
+        print(f"{k:>6}{coarse_rate:>15,.0f}{coarse.contended:>11,}{rate:>16,.0f}"
+              f"{s['head_contended'] + s['tail_contended']:>11,}{s['slow_path']:>11,}")
+
+
+if __name__ == "__main__":
+    main()
+    benchmark()
@@ -3,13 +3,26 @@ A doubly linked list implementation.
 
 @author me
 """
+import sys
+
 class DoublyLinkedList:
     
-    def __init__(self):
+    def __init__(self, indexed: bool = False):
         self.size_of_list: int = 0
         self.head = None
         self.tail = None
 
+        # Indexed (LinkedHashSet-like) mode: value -> the node holding it, or
+        # {node: None} once a value is held by several nodes, kept in sync on
+        # every add and remove. Unique values, the common case, cost no more
+        # than a dict slot. Values must be hashable. None when not indexed.
+        self.index = {} if indexed else None
+
+        # Finger: the last node reached by position and its index, so that
+        # sequential positional access does not restart from head or tail
+        self.finger = None
+        self.finger_index: int = 0
+
 
     # Internal node class to represent data
     class Node:
@@ -26,6 +39,35 @@ class DoublyLinkedList:
             return f"{self.data}"
 
 
+    # Record 'node' in the value index, O(1)
+    def indexNode(self, node: Node):
+        entry = self.index.get(node.data)
+        if entry is None: self.index[node.data] = node
+        elif type(entry) is dict: entry[node] = None
+        else: self.index[node.data] = {entry: None, node: None}    # first duplicate
+
+    # Drop 'node' from the value index, O(1)
+    def unindexNode(self, node: Node):
+        entry = self.index[node.data]
+        if type(entry) is not dict:
+            del self.index[node.data]
+            return
+        del entry[node]
+        # Back to a bare node once the value is unique again
+        if len(entry) == 1: self.index[node.data] = next(iter(entry))
+
+    # Nodes holding 'obj' according to the value index, () if none
+    def indexedNodes(self, obj):
+        entry = self.index.get(obj)
+        if entry is None: return ()
+        return entry if type(entry) is dict else (entry,)
+
+    # Approximate bytes used by the value index on top of the list itself
+    def indexOverhead(self) -> int:
+        if self.index is None: return 0
+        return sys.getsizeof(self.index) + sum(sys.getsizeof(entry) for entry in self.index.values()
+                                               if type(entry) is dict)
+
     # Empty this linked list, O(n)
     def clear(self):
         trav = self.head
@@ -34,6 +76,8 @@ class DoublyLinkedList:
             trav.prev = trav.next = None
             trav = next
         self.head = self.tail = trav = None
+        self.finger = None
+        if self.index is not None: self.index.clear()
         self.size_of_list = 0
     
     
@@ -58,6 +102,7 @@ class DoublyLinkedList:
         else:
             self.tail.next = self.Node(elem, self.tail, None)
             self.tail = self.tail.next
+        if self.index is not None: self.indexNode(self.tail)
         self.size_of_list += 1
 
     # Add an element to the beginning of linked list, O(1)
@@ -67,25 +112,122 @@ class DoublyLinkedList:
         else:
             self.head.prev = self.Node(elem, None, self.head)
             self.head = self.head.prev
+        if self.index is not None: self.indexNode(self.head)
+        self.finger_index += 1
         self.size_of_list += 1
 
-    # Add an element at a specified index, O(n)
+    # Add every element of an iterable to tail of linked list, O(k). If the
+    # iterable (or indexing an element) raises, the elements added so far stay.
+    def extend(self, iterable):
+        # Iterating ourselves would chase the nodes we are appending forever
+        if iterable is self: iterable = list(self)
+        Node = self.Node
+        index = self.index
+        tail = self.tail
+        count = 0
+        try:
+            for elem in iterable:
+                node = Node(elem, tail, None)
+                # Index before linking, so a failure leaves nothing half-added
+                if index is not None: self.indexNode(node)
+                if tail is None: self.head = node
+                else: tail.next = node
+                tail = node
+                count += 1
+        finally:
+            self.tail = tail
+            self.size_of_list += count
+
+    # Move every node of 'other' to directly after 'at_node' (or to the front
+    # if 'at_node' is None) without copying, O(1). 'other' is left empty.
+    # An indexed list has to index the incoming nodes, which makes it O(k).
+    def splice(self, other, at_node: Node = None):
+        if other is self: raise ValueError('Cannot splice a list into itself')
+        if other.isEmpty(): return
+
+        if self.index is not None:
+            # Index every incoming node before relinking anything; if a value
+            # can't be indexed, take back the entries made so far
+            trav = other.head
+            try:
+                while trav is not None:
+                    self.indexNode(trav)
+                    trav = trav.next
+            except BaseException:
+                done = other.head
+                while done is not trav:
+                    self.unindexNode(done)
+                    done = done.next
+                raise
+        if other.index is not None: other.index.clear()
+
+        # Positions after 'at_node' shift, so forget the finger unless appending
+        if at_node is not self.tail: self.finger = None
+
+        first, last = other.head, other.tail
+        if at_node is None:
+            after = self.head
+            self.head = first
+        else:
+            after = at_node.next
+            at_node.next = first
+        first.prev = at_node
+        last.next = after
+        if after is None: self.tail = last
+        else: after.prev = last
+
+        self.size_of_list += other.size_of_list
+        other.head = other.tail = None
+        other.size_of_list = 0
+        # The donor's finger now points into this list
+        other.finger = None
+
+    # Move every node of 'other' to tail of linked list, O(1). 'other' is left empty.
+    def concat(self, other):
+        self.splice(other, self.tail)
+
+    # Find the node at a specified index walking from whichever of head, tail
+    # or finger is closest, O(min distance); amortized O(1) for sequential access
+    def nodeAt(self, index: int) -> Node:
+        if index < 0 or index >= self.size_of_list: raise ValueError('Illegal Index')
+
+        trav, pos, dist = self.head, 0, index
+        if self.size_of_list - 1 - index < dist:
+            trav, pos, dist = self.tail, self.size_of_list - 1, self.size_of_list - 1 - index
+        if self.finger is not None and abs(index - self.finger_index) < dist:
+            trav, pos = self.finger, self.finger_index
+
+        while pos < index:
+            trav = trav.next
+            pos += 1
+        while pos > index:
+            trav = trav.prev
+            pos -= 1
+
+        self.finger, self.finger_index = trav, index
+        return trav
+
+    # Get the value at a specified index, O(n) worst case
+    def get(self, index: int):
+        return self.nodeAt(index).data
+
+    # Add an element at a specified index, O(n) worst case
     def addAt(self, index: int, data):
         if index < 0 or index > self.size_of_list: raise ValueError('Illegal Index')
         if index == 0:
-            self.addFirst(index)
+            self.addFirst(data)
             return
         if index == self.size_of_list:
-            self.addLast(index)
+            self.addLast(data)
             return
         
-        temp = self.head
-        for i in range(0, index - 1):
-            temp = temp.next
+        temp = self.nodeAt(index - 1)
         newNode = self.Node(data, temp, temp.next)
         temp.next.prev = newNode
         temp.next = newNode
+        if self.index is not None: self.indexNode(newNode)
 
+        self.finger, self.finger_index = newNode, index
         self.size_of_list += 1
 
     # Check value of first node if it exists, O(1)
@@ -103,6 +245,11 @@ class DoublyLinkedList:
         # Can't remove data from an empty list
         if self.isEmpty(): raise Exception('Empty list')    
 
+        # Every position shifts down by one; the finger is lost if it was the head
+        if self.finger is self.head: self.finger = None
+        self.finger_index -= 1
+        if self.index is not None: self.unindexNode(self.head)
+
         # Extract data at the head and move the head pointer forwards one node
         data = self.head.data
         self.head = self.head.next
@@ -122,6 +269,10 @@ class DoublyLinkedList:
         # Can't remove data from an empty list
         if self.isEmpty(): raise Exception('Empty list')  
 
+        # The finger is lost if it was the tail
+        if self.finger is self.tail: self.finger = None
+        if self.index is not None: self.unindexNode(self.tail)
+
         # Extract data at the tail and move the tail pointer backwards one node
         data = self.tail.data
         self.tail = self.tail.prev
@@ -141,6 +292,10 @@ class DoublyLinkedList:
         if node.prev is None: return self.removeFirst()
         if node.next is None: return self.removeLast()
 
+        # The index of 'node' is unknown here, so the finger can't be kept
+        self.finger = None
+        if self.index is not None: self.unindexNode(node)
+
         # Make the pointers of adjacent nodes skip over 'node'
         node.next.prev = node.prev
         node.prev.next = node.next
@@ -157,26 +312,58 @@ class DoublyLinkedList:
         # Return the data in the node we just removed
         return data
     
-    # Remove a node at a particular index, O(n)
+    # Relink an existing node at tail of linked list without reallocating it, O(1)
+    def moveToBack(self, node: Node):
+        if node is self.tail: return
+        # Positions from 'node' onwards shift, so the finger can't be kept
+        self.finger = None
+
+        # Make the pointers of adjacent nodes skip over 'node'
+        if node.prev is None: self.head = node.next
+        else: node.prev.next = node.next
+        node.next.prev = node.prev
+
+        node.prev = self.tail
+        node.next = None
+        self.tail.next = node
+        self.tail = node
+
+    # Remove a node at a particular index, O(n) worst case
     def removeAt(self, index: int): # returns data
         # Make sure the index provided is valid
         if index < 0 or index >= self.size_of_list: raise ValueError('Illegal Index')
 
-        i = 0
-        trav = None
+        trav = self.nodeAt(index)
+        prev, next = trav.prev, trav.next
+        data = self.removeNode(trav)
 
-        if index < int(self.size_of_list / 2):
-           trav = self.head
-           for i in range(0, index + 1):
-               trav = trav.next
-        else:
-            trav = self.tail
-            for i in range(self.size_of_list - 1, index, -1):
-                trav = trav.prev
-        return self.removeNode(trav)
+        # Leave the finger on the node that now occupies 'index' (or its predecessor)
+        if next is not None: self.finger, self.finger_index = next, index
+        elif prev is not None: self.finger, self.finger_index = prev, index - 1
+        return data
     
-    # Remove a particular value in the linked list, O(n)
+    # Walk from head to the first node holding 'obj' using the value index,
+    # returns (index, node) or (-1, None), O(1) on a miss, O(position) on a hit
+    def firstIndexed(self, obj):
+        nodes = self.indexedNodes(obj)
+        if not nodes: return -1, None
+        index = 0
+        trav = self.head
+        while trav not in nodes:
+            index += 1
+            trav = trav.next
+        return index, trav
+
+    # Remove a particular value in the linked list, O(n); in indexed mode O(1)
+    # when the value is unique, O(position of first occurrence) otherwise
     def remove(self, obj) -> bool:
+        if self.index is not None:
+            nodes = self.indexedNodes(obj)
+            if not nodes: return False
+            if len(nodes) == 1: self.removeNode(next(iter(nodes)))
+            else: self.removeNode(self.firstIndexed(obj)[1])
+            return True
+
         trav = None
 
         # Support searching for null
@@ -199,6 +386,8 @@ class DoublyLinkedList:
     
     # Find the index of a particular value in the linked list, O(n)
     def indexOf(self, obj) -> int:
+        if self.index is not None: return self.firstIndexed(obj)[0]
+
         index = 0
         trav = self.head
 
@@ -218,20 +407,54 @@ class DoublyLinkedList:
                 trav = trav.next
         return -1
     
-    # Check is a value is contained within the linked list
+    # Check is a value is contained within the linked list, O(n); O(1) in indexed mode
     def contains(self, obj) -> bool:
+        if self.index is not None: return obj in self.index
         return self.indexOf(obj) != -1
     
-    def __str__(self):
-        s = '['
+    # Lazily yield every node from head to tail. The next node is read before
+    # yielding, so the caller may removeNode the node it was just given.
+    def nodes(self):
         trav = self.head
         while trav is not None:
-            s += str(trav.data)
-            if trav.next is not None:
-                s += ', '
+            next = trav.next
+            yield trav
+            trav = next
+
+    # Lazily yield every node from tail to head, removal-safe like nodes()
+    def reversedNodes(self):
+        trav = self.tail
+        while trav is not None:
+            prev = trav.prev
+            yield trav
+            trav = prev
+
+    def __iter__(self):
+        trav = self.head
+        while trav is not None:
+            yield trav.data
             trav = trav.next
-        s += ']'
-        return s
+
+    def __reversed__(self):
+        trav = self.tail
+        while trav is not None:
+            yield trav.data
+            trav = trav.prev
+
+    def __len__(self) -> int:
+        return self.size_of_list
+
+    # Pickle as a flat run of values rather than a recursive chain of nodes
+    def __reduce__(self):
+        return (self.__class__, (self.index is not None,), None, iter(self))
+
+    # Used by pickle to rebuild the list from the flat values
+    def append(self, elem):
+        self.addLast(elem)
+
+    # Linear time: join the pieces once instead of concatenating repeatedly
+    def __str__(self):
+        return '[' + ', '.join(map(str, self)) + ']'
 
 
 # testing
@@ -257,9 +480,96 @@ def main():
     print('contains 20?', ls.contains(20))
     print(ls)
     print("is it empty now", ls.isEmpty())
+
+    other = DoublyLinkedList()
+    other.extend(range(100, 104))
+    ls.concat(other)
+    print('after concat', ls, ls.sz(), 'other', other, other.sz())
+    other.extend('ab')
+    ls.splice(other, ls.head.next)
+    print('after splice', ls, ls.sz(), 'tail', ls.peekLast())
+    other.extend([-5])
+    ls.splice(other)
+    print('after splice at front', ls, ls.sz(), 'head', ls.peekFirst())
+    # The emptied donor can be reused; its old finger must not leak into ls
+    other.extend(range(200, 210))
+    other.get(5)
+    ls.concat(other)
+    other.extend(range(300, 310))
+    print('reused donor get(5)', other.get(5), '| ls tail', ls.peekLast())
+    ls.moveToBack(ls.head)
+    print('head moved to back', ls, 'tail', ls.peekLast())
     ls.clear()
     print(ls)
     print("is it empty now", ls.isEmpty())
-    
+
+    # Indexed mode: O(1) membership and removal by value, duplicates allowed
+    seen = DoublyLinkedList(indexed=True)
+    seen.extend(['a', 'b', 'a', 'c'])
+    seen.addFirst('c')
+    print(seen, 'contains b?', seen.contains('b'), 'indexOf c', seen.indexOf('c'))
+    print('removed a?', seen.remove('a'), seen, 'contains a?', seen.contains('a'))
+    print('removed a?', seen.remove('a'), seen, 'contains a?', seen.contains('a'))
+    print('index overhead bytes', seen.indexOverhead())
+
+    # Iteration and pickling
+    import pickle
+    ls.extend(range(5))
+    print('forward', list(ls), 'reverse', list(reversed(ls)), 'len', len(ls))
+    for node in ls.nodes():
+        if node.data % 2: ls.removeNode(node)
+    print('odd removed while iterating', ls)
+    copy = pickle.loads(pickle.dumps(seen))
+    print('unpickled', copy, 'indexed?', copy.index is not None, 'contains c?', copy.contains('c'))
+
+
+# benchmark
+def benchmark(n: int = 10_000):
+    import random
+    import time
+
+    def timed(ls, indices, use_finger):
+        start = time.perf_counter()
+        for i in indices:
+            if not use_finger: ls.finger = None
+            ls.get(i)
+        return time.perf_counter() - start
+
+    ls = DoublyLinkedList()
+    ls.extend(range(n))
+    scan = list(range(n))
+    rand = [random.randrange(n) for _ in range(n)]
+    near = [min(n - 1, max(0, i + random.randint(-8, 8))) for i in range(n)]
+
+    print(f"{'workload':<22}{'head/tail walk':>16}{'with finger':>14}")
+    for name, indices in (('scan by index', scan), ('near-sequential', near), ('random index', rand)):
+        print(f"{name:<22}{timed(ls, indices, False):>15.4f}s{timed(ls, indices, True):>13.4f}s")
+
+    # pickling a long chain goes through the flat value sequence, no deep recursion
+    import pickle
+    ls = DoublyLinkedList()
+    ls.extend(range(100 * n))
+    start = time.perf_counter()
+    copy = pickle.loads(pickle.dumps(ls))
+    print(f"pickle round trip of {len(copy):,} elements: {time.perf_counter() - start:.4f}s")
+    start = time.perf_counter()
+    text = str(ls)
+    print(f"str of {len(ls):,} elements ({len(text):,} chars): {time.perf_counter() - start:.4f}s")
+
+    # dedup-while-preserving-order: membership test then append
+    stream = [random.randrange(n // 2) for _ in range(n)]
+    print(f"{'dedup':<22}{'plain':>16}{'indexed':>14}")
+    times = []
+    for indexed in (False, True):
+        ls = DoublyLinkedList(indexed=indexed)
+        start = time.perf_counter()
+        for value in stream:
+            if not ls.contains(value): ls.add(value)
+        times.append(time.perf_counter() - start)
+    print(f"{'contains + add':<22}{times[0]:>15.4f}s{times[1]:>13.4f}s")
+    print(f"index overhead: {ls.indexOverhead() / ls.sz():.1f} bytes/elem")
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    benchmark()
\ No newline at end of file
@@ -0,0 +1,315 @@
+"""
+Bounded LRU and LFU caches built on DoublyLinkedList.
+
+Both are a dict from key to list node plus linked lists kept in eviction order,
+so lookups, updates and evictions are O(1) via DoublyLinkedList.removeNode.
+Capacity is a number of entries, or a total weight when a weight function is given.
+
+@author me
+"""
+from DoublyLinkedList import DoublyLinkedList
+
+class Cache:
+
+    def __init__(self, capacity, weight=None, on_evict=None):
+        if capacity <= 0: raise ValueError('Capacity must be positive')
+        self.capacity = capacity
+        # weight(key, value) -> number; every entry weighs 1 when not given
+        self.weight = weight
+        # on_evict(key, value) is called for every entry pushed out by capacity
+        self.on_evict = on_evict
+        self.total_weight = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def weigh(self, key, value):
+        return 1 if self.weight is None else self.weight(key, value)
+
+    # An entry heavier than the whole cache is never admitted; any older value
+    # under its key is dropped (not counted as an eviction) so get() can't
+    # return stale data. Returns True if the entry was rejected.
+    def rejectOversized(self, key, w) -> bool:
+        if w <= self.capacity: return False
+        self.remove(key)
+        return True
+
+    # Counters as a plain dict
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': self.size(),
+            'weight': self.total_weight,
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def evicted(self, key, value):
+        self.evictions += 1
+        if self.on_evict is not None: self.on_evict(key, value)
+
+    def isEmpty(self) -> bool:
+        return self.size() == 0
+
+
+class LRUCache(Cache):
+
+    def __init__(self, capacity, weight=None, on_evict=None):
+        super().__init__(capacity, weight, on_evict)
+        # key -> node; node.data is [key, value, weight]
+        self.map = {}
+        # Least recently used at the head, most recently used at the tail
+        self.order = DoublyLinkedList()
+
+    def size(self) -> int:
+        return len(self.map)
+
+    def contains(self, key) -> bool:
+        return key in self.map
+
+    # Move a node to the most recently used end, O(1); the node is relinked,
+    # not reallocated, so the map entry stays valid
+    def touch(self, node):
+        self.order.moveToBack(node)
+        return node.data
+
+    # Look up a value and mark it as recently used, O(1)
+    def get(self, key, default=None):
+        node = self.map.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return self.touch(node)[1]
+
+    # Look up a value without touching recency or counters, O(1)
+    def peek(self, key, default=None):
+        node = self.map.get(key)
+        return default if node is None else node.data[1]
+
+    # Insert or update a value, evicting least recently used entries to fit,
+    # O(1) per eviction. Returns False if the entry alone exceeds the capacity.
+    def put(self, key, value) -> bool:
+        w = self.weigh(key, value)
+        if self.rejectOversized(key, w): return False
+        node = self.map.get(key)
+        if node is not None:
+            self.total_weight -= node.data[2]
+            node.data[1], node.data[2] = value, w
+            self.touch(node)
+        else:
+            self.order.addLast([key, value, w])
+            self.map[key] = self.order.tail
+        self.total_weight += w
+
+        # Evict from the least recently used end until we fit again; the new
+        # entry sits at the other end and fits on its own, so it stays
+        while self.total_weight > self.capacity:
+            old_key, old_value, old_w = self.order.removeFirst()
+            del self.map[old_key]
+            self.total_weight -= old_w
+            self.evicted(old_key, old_value)
+        return True
+
+    # Drop an entry without counting it as an eviction, O(1)
+    def remove(self, key) -> bool:
+        node = self.map.pop(key, None)
+        if node is None: return False
+        self.total_weight -= node.data[2]
+        self.order.removeNode(node)
+        return True
+
+    def clear(self):
+        self.map.clear()
+        self.order.clear()
+        self.total_weight = 0
+
+    def __str__(self):
+        return 'LRU [' + ', '.join(f'{k}: {v}' for k, v, _ in self.items()) + '] MRU'
+
+    # (key, value, weight) from least to most recently used
+    def items(self):
+        trav = self.order.head
+        while trav is not None:
+            yield tuple(trav.data)
+            trav = trav.next
+
+
+class LFUCache(Cache):
+
+    def __init__(self, capacity, weight=None, on_evict=None):
+        super().__init__(capacity, weight, on_evict)
+        # key -> node; node.data is [key, value, weight, frequency]
+        self.map = {}
+        # frequency -> DoublyLinkedList of nodes used that often, LRU order within a bucket
+        self.buckets = {}
+        self.min_freq = 0
+
+    def size(self) -> int:
+        return len(self.map)
+
+    def contains(self, key) -> bool:
+        return key in self.map
+
+    # Append an entry to the bucket of its frequency and index the new node, O(1)
+    def link(self, entry):
+        bucket = self.buckets.get(entry[3])
+        if bucket is None:
+            bucket = self.buckets[entry[3]] = DoublyLinkedList()
+        bucket.addLast(entry)
+        self.map[entry[0]] = bucket.tail
+
+    # Take a node out of its bucket, dropping the bucket once it drains, O(1)
+    def unlink(self, node):
+        freq = node.data[3]
+        bucket = self.buckets[freq]
+        bucket.removeNode(node)
+        if bucket.isEmpty(): del self.buckets[freq]
+
+    # Bump the use count of a node, O(1)
+    def touch(self, node):
+        entry = node.data
+        self.unlink(node)
+        if entry[3] == self.min_freq and entry[3] not in self.buckets: self.min_freq += 1
+        entry[3] += 1
+        self.link(entry)
+        return entry
+
+    # Look up a value and count the use, O(1)
+    def get(self, key, default=None):
+        node = self.map.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return self.touch(node)[1]
+
+    # Look up a value without touching frequency or counters, O(1)
+    def peek(self, key, default=None):
+        node = self.map.get(key)
+        return default if node is None else node.data[1]
+
+    # Usage count of a key, 0 if absent
+    def frequency(self, key) -> int:
+        node = self.map.get(key)
+        return 0 if node is None else node.data[3]
+
+    # Insert or update a value, evicting the least frequently used entries to fit.
+    # Ties go to the least recently used. O(1) per eviction, plus a scan of the
+    # distinct frequencies whenever a weighted put drains the lowest bucket.
+    # Returns False if the entry alone exceeds the capacity.
+    def put(self, key, value) -> bool:
+        w = self.weigh(key, value)
+        if self.rejectOversized(key, w): return False
+        node = self.map.get(key)
+        if node is not None:
+            entry = node.data
+            self.total_weight += w - entry[2]
+            entry[1], entry[2] = value, w
+            # Take the entry out of its bucket while making room, so the
+            # update can't evict the very value it writes
+            self.unlink(node)
+            while self.total_weight > self.capacity:
+                self.evictOne()
+            entry[3] += 1
+            self.link(entry)
+            if entry[3] < self.min_freq: self.min_freq = entry[3]
+            return True
+
+        self.total_weight += w
+        # Make room among the existing entries before the newcomer joins
+        while self.total_weight > self.capacity:
+            self.evictOne()
+        self.link([key, value, w, 1])
+        self.min_freq = 1
+        return True
+
+    def evictOne(self):
+        if self.min_freq not in self.buckets: self.min_freq = min(self.buckets)
+        old_key, old_value, old_w, _ = self.buckets[self.min_freq].peekFirst()
+        self.unlink(self.map.pop(old_key))
+        self.total_weight -= old_w
+        self.evicted(old_key, old_value)
+
+    # Drop an entry without counting it as an eviction, O(1)
+    def remove(self, key) -> bool:
+        node = self.map.pop(key, None)
+        if node is None: return False
+        self.total_weight -= node.data[2]
+        self.unlink(node)
+        return True
+
+    def clear(self):
+        self.map.clear()
+        self.buckets.clear()
+        self.min_freq = 0
+        self.total_weight = 0
+
+    def __str__(self):
+        return 'LFU {' + ', '.join(f'{k}: {v} (x{f})' for k, v, _, f in
+                                   (node.data for node in self.map.values())) + '}'
+
+
+# testing
+def main():
+    evicted = []
+    lru = LRUCache(3, on_evict=lambda k, v: evicted.append(k))
+    for k in 'abc': lru.put(k, ord(k))
+    print(lru)
+    print('get a', lru.get('a'))
+    lru.put('d', ord('d'))           # evicts b, the least recently used
+    print(lru, 'evicted', evicted)
+    print('peek c', lru.peek('c'), 'get b', lru.get('b', 'miss'))
+    lru.put('c', 0)                   # update moves c to the MRU end
+    print(lru)
+    print(lru.stats())
+
+    # Weighted capacity: total length of the cached strings
+    lru = LRUCache(10, weight=lambda k, v: len(v))
+    lru.put(1, 'aaaa')
+    lru.put(2, 'bbbb')
+    lru.put(3, 'cccc')               # 12 > 10, evicts key 1
+    print(lru, lru.stats()['weight'])
+    print('admitted?', lru.put(4, 'x' * 11), lru, lru.stats())   # too heavy on its own: rejected, nothing evicted
+    lru.put(2, 'yyyyyyyyyyyy')       # oversized update drops the stale value of key 2
+    print(lru, 'get 2', lru.get(2))
+
+    evicted.clear()
+    lfu = LFUCache(3, on_evict=lambda k, v: evicted.append(k))
+    for k in 'abc': lfu.put(k, ord(k))
+    lfu.get('a'); lfu.get('a'); lfu.get('b')
+    lfu.put('d', ord('d'))           # evicts c, used the least
+    lfu.put('e', ord('e'))           # evicts d, the only entry still at frequency 1
+    print(lfu, 'evicted', evicted)
+    print('frequency a', lfu.frequency('a'), 'get c', lfu.get('c', 'miss'))
+    print(lfu.stats())
+
+    lfu = LFUCache(10, weight=lambda k, v: v)
+    lfu.put('x', 4); lfu.put('y', 4); lfu.get('x'); lfu.get('y'); lfu.get('y')
+    lfu.put('z', 5)                  # needs to evict x (freq 2) to fit
+    print(lfu, lfu.stats()['weight'])
+    print('admitted?', lfu.put('big', 11), lfu, lfu.stats()['evictions'])
+
+
+# benchmark: memoizing a skewed lookup stream
+def benchmark(n: int = 200_000, capacity: int = 1_000):
+    import random
+    import time
+
+    keys = [int(random.expovariate(1 / capacity)) for _ in range(n)]
+    for name, cache in (('LRUCache', LRUCache(capacity)), ('LFUCache', LFUCache(capacity))):
+        start = time.perf_counter()
+        for k in keys:
+            if cache.get(k) is None: cache.put(k, k)
+        elapsed = time.perf_counter() - start
+        stats = cache.stats()
+        print(f"{name:<10}{n / elapsed:>12,.0f} ops/sec  hit rate {stats['hit_rate']:.3f}  evictions {stats['evictions']}")
+
+
+if __name__ == "__main__":
+    main()
+    benchmark()
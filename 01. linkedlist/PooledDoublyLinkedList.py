@@ -0,0 +1,239 @@
+"""
+A doubly linked list backed by parallel preallocated arrays instead of node objects.
+
+Every element lives in a 'slot': data[slot], prev[slot] and next[slot]. Links are
+slot indices (NIL = -1 means no node), freed slots are recycled through a free list
+threaded through the 'next' array, and the arrays grow geometrically when the pool
+runs out. The slot index returned by add* is the handle used by removeNode.
+Free slots carry FREE in 'prev', so removing or reading a handle twice raises
+ValueError; a handle kept after its slot was handed out again cannot be told apart.
+
+@author me
+"""
+from array import array
+
+class PooledDoublyLinkedList:
+
+    # Marks the absence of a node, the equivalent of None for a Node reference
+    NIL = -1
+    # Stored in prev[slot] while the slot is on the free list
+    FREE = -2
+
+    def __init__(self, capacity: int = 16):
+        if capacity <= 0: raise ValueError('Capacity must be positive')
+        self.size_of_list: int = 0
+        self.head = self.NIL
+        self.tail = self.NIL
+
+        # Parallel arrays holding the payload and the links of every slot
+        self.data = [None] * capacity
+        self.prev = array('q', [self.FREE]) * capacity
+        self.next = array('q', range(1, capacity + 1))
+        self.next[capacity - 1] = self.NIL
+
+        # Head of the free list, chained through self.next
+        self.free = 0
+
+
+    # Double the pool and chain the new slots onto the free list, O(n)
+    def grow(self):
+        old = len(self.data)
+        new = old * 2
+        self.data.extend([None] * old)
+        self.prev.extend(array('q', [self.FREE]) * old)
+        self.next.extend(range(old + 1, new + 1))
+        self.next[new - 1] = self.free
+        self.free = old
+
+    # Take a slot off the free list, amortized O(1)
+    def allocate(self, elem, prev: int, next: int) -> int:
+        if self.free == self.NIL: self.grow()
+        slot = self.free
+        self.free = self.next[slot]
+        self.data[slot] = elem
+        self.prev[slot] = prev
+        self.next[slot] = next
+        return slot
+
+    # Give a slot back to the free list, O(1)
+    def release(self, slot: int):
+        self.data[slot] = None      # drop the reference so the payload can be collected
+        self.prev[slot] = self.FREE
+        self.next[slot] = self.free
+        self.free = slot
+
+
+    # Empty this linked list and return every slot to the free list, O(capacity)
+    def clear(self):
+        capacity = len(self.data)
+        self.data = [None] * capacity
+        self.prev = array('q', [self.FREE]) * capacity
+        self.next = array('q', range(1, capacity + 1))
+        self.next[capacity - 1] = self.NIL
+        self.free = 0
+        self.head = self.tail = self.NIL
+        self.size_of_list = 0
+
+    # Return size of linked list
+    def sz(self) -> int:
+        return self.size_of_list
+
+    # Number of slots currently allocated in the pool
+    def capacity(self) -> int:
+        return len(self.data)
+
+    # Is the Linked list empty?
+    def isEmpty(self) -> bool:
+        return self.size_of_list == 0
+
+
+    # Add an element to tail of linked list, O(1)
+    def add(self, elem) -> int:
+        return self.addLast(elem)
+
+    # Add an element to tail of linked list and return its handle, O(1)
+    def addLast(self, elem) -> int:
+        slot = self.allocate(elem, self.tail, self.NIL)
+        if self.tail == self.NIL: self.head = slot
+        else: self.next[self.tail] = slot
+        self.tail = slot
+        self.size_of_list += 1
+        return slot
+
+    # Add an element to the beginning of linked list and return its handle, O(1)
+    def addFirst(self, elem) -> int:
+        slot = self.allocate(elem, self.NIL, self.head)
+        if self.head == self.NIL: self.tail = slot
+        else: self.prev[self.head] = slot
+        self.head = slot
+        self.size_of_list += 1
+        return slot
+
+    # Check value of first node if it exists, O(1)
+    def peekFirst(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.data[self.head]
+
+    # Check value of last node if it exists, O(1)
+    def peekLast(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.data[self.tail]
+
+    # Reject handles that are out of range or point at a free slot, O(1)
+    def checkHandle(self, node: int):
+        if not 0 <= node < len(self.data) or self.prev[node] == self.FREE:
+            raise ValueError('Invalid or freed handle')
+
+    # Value stored under a handle, O(1)
+    def get(self, node: int):
+        self.checkHandle(node)
+        return self.data[node]
+
+    # Remove the first value at the head of linked list, O(1)
+    def removeFirst(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.removeNode(self.head)
+
+    # Remove the last value at the tail of the linked list, O(1)
+    def removeLast(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.removeNode(self.tail)
+
+    # Remove an arbitrary node given its handle, O(1)
+    def removeNode(self, node: int):
+        self.checkHandle(node)
+        prev = self.prev[node]
+        next = self.next[node]
+
+        # Make the links of adjacent slots skip over 'node'
+        if prev == self.NIL: self.head = next
+        else: self.next[prev] = next
+        if next == self.NIL: self.tail = prev
+        else: self.prev[next] = prev
+
+        data = self.data[node]
+        self.release(node)
+        self.size_of_list -= 1
+        return data
+
+    def __str__(self):
+        values = []
+        trav = self.head
+        while trav != self.NIL:
+            values.append(str(self.data[trav]))
+            trav = self.next[trav]
+        return '[' + ', '.join(values) + ']'
+
+
+# testing
+def main():
+    ls = PooledDoublyLinkedList(capacity=4)
+    print(ls, ls.sz(), ls.isEmpty())
+    handles = {}
+    for i in range(0, 20, 2):
+        handles[i] = ls.add(i)
+        print('added ', i)
+    ls.addFirst(-1)
+    ls.addLast(22)
+    print(ls.peekFirst())
+    print(ls.peekLast())
+    print(ls.sz(), 'capacity', ls.capacity())
+    print(ls)
+
+    print(ls.removeFirst())
+    print(ls.removeLast())
+    print('removed by handle', ls.removeNode(handles[8]))
+    print('removed by handle', ls.removeNode(handles[0]))
+    print(ls)
+    try:
+        ls.removeNode(handles[0])
+    except ValueError as e:
+        print('removing a handle twice:', e)
+
+    # Freed slots are recycled before the pool grows again
+    capacity = ls.capacity()
+    for i in range(4):
+        ls.addFirst(100 + i)
+    print(ls, 'pool grew?', ls.capacity() != capacity)
+
+    while not ls.isEmpty(): ls.removeLast()
+    print(ls, "is it empty now", ls.isEmpty())
+    ls.add(1)
+    ls.clear()
+    print(ls, "is it empty now", ls.isEmpty())
+
+
+# benchmark against the node-object DoublyLinkedList
+def benchmark(n: int = 200_000):
+    import time
+    import tracemalloc
+    from DoublyLinkedList import DoublyLinkedList
+
+    def bytesPerElement(factory):
+        tracemalloc.start()
+        ls = factory()
+        for i in range(n): ls.addLast(i)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return used / n
+
+    def opsPerSecond(factory):
+        ls = factory()
+        start = time.perf_counter()
+        for i in range(n):
+            ls.addLast(i)
+            ls.addFirst(i)
+        for i in range(n):
+            ls.removeFirst()
+            ls.removeLast()
+        return 4 * n / (time.perf_counter() - start)
+
+    print(f"{'list':<24}{'bytes/elem':>12}{'ops/sec':>14}")
+    for name, factory in (('DoublyLinkedList', DoublyLinkedList),
+                          ('PooledDoublyLinkedList', PooledDoublyLinkedList)):
+        print(f"{name:<24}{bytesPerElement(factory):>12.1f}{opsPerSecond(factory):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
+    benchmark()
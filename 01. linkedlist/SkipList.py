@@ -0,0 +1,290 @@
+"""
+An indexable skip list keeping its values in sorted order.
+
+Every node is linked on a random number of levels; each link also stores its
+'width', the number of level 0 steps it skips, which gives expected O(log(n))
+rank and select-by-index on top of the usual insert, delete and search.
+Level 0 is additionally linked backwards for reverse iteration. Equal values
+are kept in insertion order.
+
+@author me
+"""
+import random
+
+class SkipList:
+
+    MAX_LEVEL = 32
+    P = 0.5
+
+    # Internal node class; 'next' and 'width' have one entry per level
+    class Node:
+        def __init__(self, value, level: int):
+            self.value = value
+            self.next = [None] * level
+            self.width = [1] * level
+            self.prev = None        # level 0 predecessor, None for the first node
+
+        def __str__(self):
+            return f"{self.value}"
+
+
+    def __init__(self, data=None): # data is iterable
+        self.size_of_list: int = 0
+        # Sentinels: 'head' comes before every value, 'nil' after every value
+        self.nil = self.Node(None, 0)
+        self.head = self.Node(None, self.MAX_LEVEL)
+        self.head.next = [self.nil] * self.MAX_LEVEL
+        self.tail = None
+        # Number of levels currently in use
+        self.level = 1
+        if data is not None:
+            for value in data: self.add(value)
+
+    # Empty this skip list, O(1)
+    def clear(self):
+        self.head.next = [self.nil] * self.MAX_LEVEL
+        self.head.width = [1] * self.MAX_LEVEL
+        self.tail = None
+        self.level = 1
+        self.size_of_list = 0
+
+    # Return size of skip list
+    def sz(self) -> int:
+        return self.size_of_list
+
+    # Is the skip list empty?
+    def isEmpty(self) -> bool:
+        return self.size_of_list == 0
+
+    def __len__(self) -> int:
+        return self.size_of_list
+
+    # Flip coins for the number of levels of a new node
+    def randomLevel(self) -> int:
+        level = 1
+        while level < self.MAX_LEVEL and random.random() < self.P: level += 1
+        return level
+
+
+    # Insert a value in sorted position, after any equal values, expected O(log(n))
+    def add(self, value):
+        if value is None: raise ValueError('Cannot add None to a SkipList')
+        chain = [None] * self.MAX_LEVEL
+        steps = [0] * self.MAX_LEVEL
+        node = self.head
+        for level in range(self.level - 1, -1, -1):
+            next = node.next[level]
+            while next is not self.nil and next.value <= value:
+                steps[level] += node.width[level]
+                node = next
+                next = node.next[level]
+            chain[level] = node
+
+        height = self.randomLevel()
+        if height > self.level:
+            for level in range(self.level, height):
+                chain[level] = self.head
+                self.head.width[level] = self.size_of_list + 1
+            self.level = height
+
+        # Splice in level by level; 'skipped' is the distance from chain[level] to the new node - 1
+        new = self.Node(value, height)
+        skipped = 0
+        for level in range(height):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - skipped
+            prev.width[level] = skipped + 1
+            skipped += steps[level]
+        # Higher links now jump over one more node
+        for level in range(height, self.level):
+            chain[level].width[level] += 1
+
+        if chain[0] is not self.head: new.prev = chain[0]
+        if new.next[0] is self.nil: self.tail = new
+        else: new.next[0].prev = new
+        self.size_of_list += 1
+
+    # Unlink 'target' given its predecessor on every level, expected O(log(n))
+    def unlink(self, chain, target: Node):
+        for level in range(self.level):
+            prev = chain[level]
+            if prev.next[level] is target:
+                prev.width[level] += target.width[level] - 1
+                prev.next[level] = target.next[level]
+            else:
+                prev.width[level] -= 1
+
+        next = target.next[0]
+        if next is self.nil: self.tail = target.prev
+        else: next.prev = target.prev
+        while self.level > 1 and self.head.next[self.level - 1] is self.nil:
+            self.level -= 1
+        self.size_of_list -= 1
+        return target.value
+
+    # Predecessors of the first node holding a value >= 'value' on every level,
+    # and that node's index
+    def chainBefore(self, value):
+        chain = [None] * self.level
+        index = 0
+        node = self.head
+        for level in range(self.level - 1, -1, -1):
+            next = node.next[level]
+            while next is not self.nil and next.value < value:
+                index += node.width[level]
+                node = next
+                next = node.next[level]
+            chain[level] = node
+        return chain, index
+
+    # Predecessors of the node at position 'index' on every level
+    def chainBeforeIndex(self, index: int):
+        chain = [None] * self.level
+        node = self.head
+        remaining = index + 1       # the head sits at position -1
+        for level in range(self.level - 1, -1, -1):
+            while node.next[level] is not self.nil and node.width[level] < remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        return chain
+
+    # Remove the first occurrence of a value, expected O(log(n))
+    def remove(self, value) -> bool:
+        if value is None or self.isEmpty(): return False
+        chain, _ = self.chainBefore(value)
+        target = chain[0].next[0]
+        if target is self.nil or target.value != value: return False
+        self.unlink(chain, target)
+        return True
+
+    # Remove the value at a particular index, expected O(log(n))
+    def removeAt(self, index: int):
+        if index < 0 or index >= self.size_of_list: raise ValueError('Illegal Index')
+        chain = self.chainBeforeIndex(index)
+        return self.unlink(chain, chain[0].next[0])
+
+    # Select the value at a particular index, expected O(log(n))
+    def get(self, index: int):
+        if index < 0 or index >= self.size_of_list: raise ValueError('Illegal Index')
+        return self.chainBeforeIndex(index)[0].next[0].value
+
+    # Number of values strictly smaller than 'value', expected O(log(n))
+    def rank(self, value) -> int:
+        return self.chainBefore(value)[1]
+
+    # Index of the first occurrence of a value or -1, expected O(log(n))
+    def indexOf(self, value) -> int:
+        if value is None or self.isEmpty(): return -1
+        chain, index = self.chainBefore(value)
+        next = chain[0].next[0]
+        return index if next is not self.nil and next.value == value else -1
+
+    # Check if a value is in the skip list, expected O(log(n))
+    def contains(self, value) -> bool:
+        return self.indexOf(value) != -1
+
+    # Largest value strictly smaller than 'value', or None, expected O(log(n))
+    def predecessor(self, value):
+        if self.isEmpty(): return None
+        node = self.chainBefore(value)[0][0]
+        return None if node is self.head else node.value
+
+    # Smallest value strictly greater than 'value', or None, expected O(log(n))
+    def successor(self, value):
+        node = self.head
+        for level in range(self.level - 1, -1, -1):
+            next = node.next[level]
+            while next is not self.nil and next.value <= value:
+                node = next
+                next = node.next[level]
+        next = node.next[0]
+        return None if next is self.nil else next.value
+
+    # Check value of the smallest element if it exists, O(1)
+    def peekFirst(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.head.next[0].value
+
+    # Check value of the largest element if it exists, O(1)
+    def peekLast(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.tail.value
+
+    # Remove the smallest value, O(levels)
+    def removeFirst(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.unlink([self.head] * self.level, self.head.next[0])
+
+    # Remove the largest value, expected O(log(n))
+    def removeLast(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.removeAt(self.size_of_list - 1)
+
+    def __iter__(self):
+        trav = self.head.next[0]
+        while trav is not self.nil:
+            yield trav.value
+            trav = trav.next[0]
+
+    def __reversed__(self):
+        trav = self.tail
+        while trav is not None:
+            yield trav.value
+            trav = trav.prev
+
+    def __str__(self):
+        return '[' + ', '.join(map(str, self)) + ']'
+
+
+# testing
+def main():
+    sl = SkipList([5, 1, 9, 3, 7])
+    print(sl, sl.sz(), sl.isEmpty())
+    sl.add(4)
+    sl.add(3)
+    print(sl, 'levels in use', sl.level)
+    print('peek', sl.peekFirst(), sl.peekLast())
+    print('get(2)', sl.get(2), 'indexOf 3', sl.indexOf(3), 'indexOf 6', sl.indexOf(6), 'rank 6', sl.rank(6))
+    print('contains 7?', sl.contains(7), 'contains 8?', sl.contains(8))
+    print('predecessor 5', sl.predecessor(5), 'successor 5', sl.successor(5))
+    print('predecessor 1', sl.predecessor(1), 'successor 9', sl.successor(9))
+    print('reversed', list(reversed(sl)))
+
+    print('removeFirst', sl.removeFirst(), 'removeLast', sl.removeLast(), 'removeAt(2)', sl.removeAt(2))
+    print('remove 3?', sl.remove(3), 'remove 42?', sl.remove(42))
+    print(sl, sl.sz())
+    sl.clear()
+    print(sl, "is it empty now", sl.isEmpty())
+
+
+# benchmark: keeping a sequence sorted
+def benchmark(n: int = 5_000):
+    import time
+    from DoublyLinkedList import DoublyLinkedList
+
+    values = [random.random() for _ in range(n)]
+
+    start = time.perf_counter()
+    ls = DoublyLinkedList()
+    for value in values:
+        index = 0
+        for elem in ls:
+            if elem > value: break
+            index += 1
+        ls.addAt(index, value)
+    dll = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sl = SkipList()
+    for value in values: sl.add(value)
+    skip = time.perf_counter() - start
+
+    print(f"sorted insert of {n:,} values: DoublyLinkedList {dll:.4f}s, SkipList {skip:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
+    benchmark()
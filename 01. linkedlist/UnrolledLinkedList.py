@@ -0,0 +1,299 @@
+"""
+An unrolled doubly linked list: every node holds up to 'block' elements in a
+Python list, so walking the sequence chases one pointer per block instead of
+one per element. Full nodes split in half, and nodes that drain below half full
+borrow from or merge with their successor.
+
+@author me
+"""
+class UnrolledLinkedList:
+
+    # Internal node class holding a small array of elements
+    class Node:
+        def __init__(self, elems=None, prev=None, next=None):
+            self.elems = [] if elems is None else elems
+            self.prev = prev
+            self.next = next
+
+        def __str__(self):
+            return f"{self.elems}"
+
+
+    def __init__(self, block: int = 64):
+        if block < 2: raise ValueError('Block size must be at least 2')
+        self.block = block
+        self.size_of_list: int = 0
+        self.head = None
+        self.tail = None
+
+    # Empty this linked list, O(n/B)
+    def clear(self):
+        trav = self.head
+        while trav is not None:
+            next = trav.next
+            trav.prev = trav.next = None
+            trav = next
+        self.head = self.tail = None
+        self.size_of_list = 0
+
+    # Return size of linked list
+    def sz(self) -> int:
+        return self.size_of_list
+
+    # Is the Linked list empty?
+    def isEmpty(self) -> bool:
+        return self.size_of_list == 0
+
+    def __len__(self) -> int:
+        return self.size_of_list
+
+
+    # Insert a fresh node after 'node' (or at the front if 'node' is None), O(1)
+    def linkAfter(self, node: Node, elems) -> Node:
+        if node is None:
+            new = self.Node(elems, None, self.head)
+            if self.head is None: self.tail = new
+            else: self.head.prev = new
+            self.head = new
+        else:
+            new = self.Node(elems, node, node.next)
+            if node.next is None: self.tail = new
+            else: node.next.prev = new
+            node.next = new
+        return new
+
+    # Unlink an empty node, O(1)
+    def unlink(self, node: Node):
+        if node.prev is None: self.head = node.next
+        else: node.prev.next = node.next
+        if node.next is None: self.tail = node.prev
+        else: node.next.prev = node.prev
+        node.prev = node.next = None
+
+    # Move the upper half of a full node into a new node after it, O(B)
+    def split(self, node: Node):
+        half = len(node.elems) // 2
+        self.linkAfter(node, node.elems[half:])
+        del node.elems[half:]
+
+    # Restore the half-full invariant of 'node' after a removal, O(B)
+    def rebalance(self, node: Node):
+        if not node.elems:
+            self.unlink(node)
+            return
+        if len(node.elems) >= self.block // 2 or node.next is None: return
+        next = node.next
+        if len(node.elems) + len(next.elems) <= self.block:
+            # Merge the successor into this node
+            node.elems.extend(next.elems)
+            next.elems = []
+            self.unlink(next)
+        else:
+            # Borrow enough from the successor to reach half full
+            take = self.block // 2 - len(node.elems)
+            node.elems.extend(next.elems[:take])
+            del next.elems[:take]
+
+    # Find the node holding position 'index' and the offset within it, O(n/B)
+    def locate(self, index: int):
+        if index < self.size_of_list // 2:
+            trav = self.head
+            while index >= len(trav.elems):
+                index -= len(trav.elems)
+                trav = trav.next
+            return trav, index
+        index = self.size_of_list - index
+        trav = self.tail
+        while index > len(trav.elems):
+            index -= len(trav.elems)
+            trav = trav.prev
+        return trav, len(trav.elems) - index
+
+
+    # Add an element to tail of linked list, O(1)
+    def add(self, elem):
+        self.addLast(elem)
+
+    # Add an element to tail of linked list, O(1)
+    def addLast(self, elem):
+        if self.tail is None or len(self.tail.elems) >= self.block:
+            self.linkAfter(self.tail, [elem])
+        else:
+            self.tail.elems.append(elem)
+        self.size_of_list += 1
+
+    # Add an element to the beginning of linked list, O(B)
+    def addFirst(self, elem):
+        if self.head is None or len(self.head.elems) >= self.block:
+            self.linkAfter(None, [elem])
+        else:
+            self.head.elems.insert(0, elem)
+        self.size_of_list += 1
+
+    # Add every element of an iterable to tail of linked list, O(k)
+    def extend(self, iterable):
+        for elem in iterable: self.addLast(elem)
+
+    # Add an element at a specified index, O(n/B + B)
+    def addAt(self, index: int, data):
+        if index < 0 or index > self.size_of_list: raise ValueError('Illegal Index')
+        if index == self.size_of_list:
+            self.addLast(data)
+            return
+        node, offset = self.locate(index)
+        node.elems.insert(offset, data)
+        if len(node.elems) > self.block: self.split(node)
+        self.size_of_list += 1
+
+    # Get the value at a specified index, O(n/B)
+    def get(self, index: int):
+        if index < 0 or index >= self.size_of_list: raise ValueError('Illegal Index')
+        node, offset = self.locate(index)
+        return node.elems[offset]
+
+    # Replace the value at a specified index, O(n/B)
+    def set(self, index: int, data):
+        if index < 0 or index >= self.size_of_list: raise ValueError('Illegal Index')
+        node, offset = self.locate(index)
+        node.elems[offset] = data
+
+    # Check value of first element if it exists, O(1)
+    def peekFirst(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.head.elems[0]
+
+    # Check value of last element if it exists, O(1)
+    def peekLast(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.tail.elems[-1]
+
+    # Remove the first value of linked list, O(B)
+    def removeFirst(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        return self.removeAt(0)
+
+    # Remove the last value of linked list, O(1)
+    def removeLast(self):
+        if self.isEmpty(): raise Exception('Empty list')
+        tail = self.tail
+        data = tail.elems.pop()
+        if not tail.elems: self.unlink(tail)
+        self.size_of_list -= 1
+        return data
+
+    # Remove the value at a particular index, O(n/B + B)
+    def removeAt(self, index: int):
+        if index < 0 or index >= self.size_of_list: raise ValueError('Illegal Index')
+        node, offset = self.locate(index)
+        data = node.elems.pop(offset)
+        self.rebalance(node)
+        self.size_of_list -= 1
+        return data
+
+    # Find the index of a particular value, O(n)
+    def indexOf(self, obj) -> int:
+        index = 0
+        trav = self.head
+        while trav is not None:
+            for elem in trav.elems:
+                if elem is obj or elem == obj: return index
+                index += 1
+            trav = trav.next
+        return -1
+
+    # Check is a value is contained within the linked list, O(n)
+    def contains(self, obj) -> bool:
+        return self.indexOf(obj) != -1
+
+    def __iter__(self):
+        trav = self.head
+        while trav is not None:
+            yield from trav.elems
+            trav = trav.next
+
+    def __reversed__(self):
+        trav = self.tail
+        while trav is not None:
+            yield from reversed(trav.elems)
+            trav = trav.prev
+
+    def __str__(self):
+        return '[' + ', '.join(map(str, self)) + ']'
+
+
+# testing
+def main():
+    ls = UnrolledLinkedList(block=4)
+    print(ls, ls.sz(), ls.isEmpty())
+    for i in range(0, 20, 2):
+        ls.add(i)
+    ls.addFirst(-1)
+    ls.addLast(22)
+    ls.addAt(11, 20)
+    ls.addAt(3, 3)
+    print(ls, ls.sz())
+    print('peek', ls.peekFirst(), ls.peekLast(), 'get(3)', ls.get(3))
+
+    # Blocks as stored
+    trav, blocks = ls.head, []
+    while trav is not None:
+        blocks.append(trav.elems)
+        trav = trav.next
+    print('blocks', blocks)
+
+    print(ls.removeFirst(), ls.removeLast(), ls.removeAt(5))
+    print(ls, ls.sz())
+    print('indexOf 12', ls.indexOf(12), 'contains 5?', ls.contains(5))
+    print('reversed', list(reversed(ls)))
+    while ls.sz() > 2: ls.removeAt(ls.sz() // 2)
+    print(ls, ls.sz())
+    ls.clear()
+    print(ls, "is it empty now", ls.isEmpty())
+
+
+# benchmark against the node-per-element DoublyLinkedList
+def benchmark(n: int = 200_000, inserts: int = 300):
+    import time
+    import tracemalloc
+    from DoublyLinkedList import DoublyLinkedList
+
+    def memory(factory):
+        tracemalloc.start()
+        ls = factory()
+        for i in range(n): ls.add(i)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return ls, used / n
+
+    dll, dll_mem = memory(DoublyLinkedList)
+    ull, ull_mem = memory(UnrolledLinkedList)
+
+    start = time.perf_counter()
+    trav = dll.head
+    while trav is not None:
+        trav.data
+        trav = trav.next
+    dll_iter = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in ull: pass
+    ull_iter = time.perf_counter() - start
+
+    def middleInserts(ls, insert):
+        start = time.perf_counter()
+        for i in range(inserts):
+            insert(ls.sz() // 2, i)
+        return time.perf_counter() - start
+
+    def dllInsert(index, value):
+        dll.finger = None           # measure the walk itself, not the finger cache
+        dll.addAt(index, value)
+
+    print(f"{'':<22}{'DoublyLinkedList':>18}{'UnrolledLinkedList':>20}")
+    print(f"{'bytes/elem':<22}{dll_mem:>18.1f}{ull_mem:>20.1f}")
+    print(f"{'iterate n':<22}{dll_iter:>17.4f}s{ull_iter:>19.4f}s")
+    print(f"{'middle inserts':<22}{middleInserts(dll, dllInsert):>17.4f}s{middleInserts(ull, ull.addAt):>19.4f}s")
+
+
+if __name__ == "__main__":
+    main()
+    benchmark()
@@ -0,0 +1,139 @@
+from collections import deque
+from math import gcd, inf
+
+'''
+A Stack that keeps the aggregate of everything on it under an associative operation.
+
+Each entry stores its element together with the aggregate of itself and everything
+below it, so aggregate() is O(1) after any push or pop. The operation only has to be
+associative (a monoid); it does not have to be commutative, which is why the
+'prepend' flag chooses whether new elements are combined after (default) or before
+the aggregate underneath them.
+'''
+
+class Monoid:
+    # An associative 'combine' together with its identity element
+    def __init__(self, combine, identity):
+        self.combine = combine
+        self.identity = identity
+
+MIN = Monoid(min, inf)
+MAX = Monoid(max, -inf)
+SUM = Monoid(lambda a, b: a + b, 0)
+GCD = Monoid(gcd, 0)
+
+
+class AggregateStack:
+
+    def __init__(self, monoid=SUM, data=None, prepend=False): # data is iterable
+        self.monoid = monoid
+        self.prepend = prepend
+        self.data = deque()     # (elem, aggregate of elem and everything below it)
+        if data is not None:
+            for elem in data: self.push(elem)
+        return
+
+    def size(self) -> int:
+        return len(self.data)
+
+    def isEmpty(self) -> bool:
+        return len(self.data) == 0
+
+    def push(self, elem): # O(1)
+        below = self.data[-1][1] if self.data else self.monoid.identity
+        if self.prepend: self.data.append((elem, self.monoid.combine(elem, below)))
+        else: self.data.append((elem, self.monoid.combine(below, elem)))
+
+    def pop(self): # pop and returns data at top, O(1)
+        if len(self.data) == 0: raise Exception('Stack is empty already')
+        return self.data.pop()[0]
+
+    def peek(self): # peek data at top of Stack, O(1)
+        if len(self.data) == 0: raise Exception('Cannot peek empty Stack')
+        return self.data[-1][0]
+
+    # Aggregate of every element on the Stack, identity when empty, O(1)
+    def aggregate(self):
+        return self.data[-1][1] if self.data else self.monoid.identity
+
+    def clear(self):
+        self.data.clear()
+
+    def __str__(self):
+        return '[' + ', '.join(str(elem) for elem, _ in self.data) + '] <- top'
+
+
+class SlidingWindowAggregator:
+    # FIFO window built from two AggregateStacks: new elements go on 'back', old
+    # ones leave from 'front'. When 'front' runs dry, 'back' is flipped onto it,
+    # so every element moves at most once and all operations are amortized O(1).
+
+    def __init__(self, monoid=SUM, data=None): # data is iterable
+        self.monoid = monoid
+        # Top of 'front' is the oldest element, so it folds the other way around
+        self.front = AggregateStack(monoid, prepend=True)
+        self.back = AggregateStack(monoid)
+        if data is not None:
+            for elem in data: self.offer(elem)
+
+    def size(self) -> int:
+        return self.front.size() + self.back.size()
+
+    def isEmpty(self) -> bool:
+        return self.size() == 0
+
+    # admit elem to back of the window
+    def offer(self, elem):
+        self.back.push(elem)
+
+    # remove the oldest elem from the window, amortized O(1)
+    def poll(self):
+        if self.front.isEmpty():
+            if self.back.isEmpty(): raise RuntimeError('Window is already empty')
+            while not self.back.isEmpty(): self.front.push(self.back.pop())
+        return self.front.pop()
+
+    # Aggregate of the whole window in arrival order, O(1)
+    def aggregate(self):
+        return self.monoid.combine(self.front.aggregate(), self.back.aggregate())
+
+    def __str__(self):
+        elems = [elem for elem, _ in reversed(self.front.data)] + [elem for elem, _ in self.back.data]
+        return 'oldest -> [' + ', '.join(map(str, elems)) + '] <- newest'
+
+# testing
+def main():
+    st = AggregateStack(MIN, [5, 3, 8])
+    print(st, 'min', st.aggregate())
+    st.push(1)
+    print(st, 'min', st.aggregate())
+    st.pop()
+    st.pop()
+    print(st, 'min', st.aggregate())
+
+    for name, monoid in (('max', MAX), ('sum', SUM), ('gcd', GCD)):
+        st = AggregateStack(monoid, [12, 18, 30])
+        print(name, st, st.aggregate())
+
+    # User supplied, non-commutative monoid: string concatenation
+    concat = Monoid(lambda a, b: a + b, '')
+    st = AggregateStack(concat, 'abc')
+    print('concat', st, repr(st.aggregate()), 'empty', repr(AggregateStack(concat).aggregate()))
+
+    # Sliding window of size 3 over a stream
+    window = SlidingWindowAggregator(MAX)
+    stream = [4, 2, 12, 3, 8, 1, 7]
+    maxima = []
+    for x in stream:
+        window.offer(x)
+        if window.size() > 3: window.poll()
+        if window.size() == 3: maxima.append(window.aggregate())
+    print('window max', maxima, window)
+
+    window = SlidingWindowAggregator(concat, 'abcd')
+    window.poll()
+    window.offer('e')
+    print('window concat', repr(window.aggregate()), window)
+
+if __name__ == "__main__":
+    main()
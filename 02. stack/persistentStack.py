@@ -0,0 +1,125 @@
+
+'''
+An immutable Stack whose versions share structure.
+
+Every version is a pointer to its top node, and each node points at the node below
+it. push and pop build a new version around the same nodes instead of changing this
+one, so keeping a snapshot is O(1) (just keep the old version) and memory grows
+with the number of distinct pushes, not the number of snapshots.
+'''
+
+class PersistentStack:
+
+    class Node:
+        def __init__(self, data, below, size):
+            self.data = data
+            self.below = below      # Node underneath, None at the bottom
+            self.size = size        # number of nodes from here to the bottom
+
+    def __init__(self, data=None, top=None): # data is iterable, pushed bottom first
+        node = top
+        if data is not None:
+            for elem in data:
+                node = PersistentStack.Node(elem, node, 1 if node is None else node.size + 1)
+        self.top = node
+        return
+
+    def size(self) -> int:
+        return 0 if self.top is None else self.top.size
+
+    def isEmpty(self) -> bool:
+        return self.top is None
+
+    def push(self, elem): # returns the new version, O(1)
+        return PersistentStack(top=PersistentStack.Node(elem, self.top, self.size() + 1))
+
+    def pop(self): # returns the version without the top element, O(1)
+        if self.top is None: raise Exception('Stack is empty already')
+        return PersistentStack(top=self.top.below)
+
+    def peek(self): # peek data at top of Stack, O(1)
+        if self.top is None: raise Exception('Cannot peek empty Stack')
+        return self.top.data
+
+    # Iterate from the top down, O(n)
+    def __iter__(self):
+        node = self.top
+        while node is not None:
+            yield node.data
+            node = node.below
+
+    def __len__(self) -> int:
+        return self.size()
+
+    def __str__(self):
+        return '[' + ', '.join(str(elem) for elem in reversed(list(self))) + '] <- top'
+
+# testing
+def main():
+    st1 = PersistentStack()
+    st2 = PersistentStack([1, 2, 3])
+    print(f'sizes {st1.size()}, {st2.size()}')
+    print(f'isEmpty? {st1.isEmpty()}, {st2.isEmpty()}')
+    print(st1)
+    print(st2)
+    st3 = st1.push(-1)
+    st4 = st2.pop()
+    print(f'peek st4: {st4.peek()}')
+    print('st1 unchanged', st1, 'st3', st3)
+    print('st2 unchanged', st2, 'st4', st4)
+
+    # Two branches growing from the same snapshot share everything below it
+    left, right = st4.push('L'), st4.push('R')
+    print(left, right, 'shared tail?', left.top.below is right.top.below)
+
+
+# benchmark: a backtracking search that snapshots the stack at every branch point,
+# starting from 'base' frames already on the stack
+def benchmark(depth: int = 6, base: int = 1_000, branchings=(2, 3, 4, 6)):
+    import time
+    import tracemalloc
+    from stack import Stack
+
+    def dequeSearch(b):
+        snapshots = []
+        def explore(st, level):
+            if level == depth: return
+            for choice in range(b):
+                branch = Stack(st.data)     # O(n) copy per branch
+                branch.push(choice)
+                snapshots.append(branch)
+                explore(branch, level + 1)
+        explore(Stack(range(base)), 0)
+        return snapshots
+
+    def persistentSearch(b):
+        snapshots = []
+        def explore(st, level):
+            if level == depth: return
+            for choice in range(b):
+                branch = st.push(choice)    # O(1), shares everything below
+                snapshots.append(branch)
+                explore(branch, level + 1)
+        explore(PersistentStack(range(base)), 0)
+        return snapshots
+
+    def measure(search, b):
+        start = time.perf_counter()
+        snapshots = search(b)
+        elapsed = time.perf_counter() - start
+        del snapshots
+        tracemalloc.start()
+        snapshots = search(b)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return len(snapshots), elapsed, used / 2**20
+
+    print(f"{'branching':>10}{'snapshots':>11}{'deque copy':>12}{'MiB':>8}{'persistent':>12}{'MiB':>8}")
+    for b in branchings:
+        count, deque_time, deque_mem = measure(dequeSearch, b)
+        _, persistent_time, persistent_mem = measure(persistentSearch, b)
+        print(f"{b:>10}{count:>11,}{deque_time:>11.3f}s{deque_mem:>8.1f}{persistent_time:>11.3f}s{persistent_mem:>8.1f}")
+
+if __name__ == "__main__":
+    main()
+    benchmark()
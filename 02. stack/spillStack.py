@@ -0,0 +1,162 @@
+from collections import deque
+import itertools
+import pickle
+import tempfile
+
+'''
+A Stack that keeps only its top 'hot_limit' elements in memory.
+
+When the in-memory hot segment grows past hot_limit, its oldest 'segment_size'
+elements are pickled as one block and appended to a temporary file. Spilled
+segments form a stack of their own, so when the hot segment runs dry the last
+block is read back and the file is truncated behind it; disk traffic is always
+one large sequential write or read per segment.
+'''
+
+class SpillStats:
+    # Counters for the disk traffic of a SpillStack
+    def __init__(self):
+        self.spills = 0             # segments written out
+        self.reloads = 0            # segments read back
+        self.bytes_spilled = 0
+        self.bytes_reloaded = 0
+        self.segments_on_disk = 0
+        self.disk_bytes = 0         # current size of the spill file
+
+    def asDict(self) -> dict:
+        return dict(vars(self))
+
+    def __str__(self):
+        return ', '.join(f'{k}={v}' for k, v in vars(self).items())
+
+
+class SpillStack:
+
+    def __init__(self, hot_limit=100_000, segment_size=None, data=None, dir=None): # data is iterable
+        if hot_limit <= 0: raise ValueError('hot_limit must be positive')
+        self.hot_limit = hot_limit
+        # Spill half the hot segment at a time by default, so a push/pop pair at
+        # the boundary never makes us write and read the same block back to back
+        self.segment_size = segment_size if segment_size is not None else max(1, hot_limit // 2)
+        if not 0 < self.segment_size <= hot_limit: raise ValueError('segment_size must be in (0, hot_limit]')
+
+        self.hot = deque()
+        self.segments = []          # (offset, length, count) of every block on disk, oldest first
+        self.spilled = 0            # number of elements on disk
+        self.dir = dir
+        self.file = None            # created on the first spill
+        self.stats = SpillStats()
+        if data is not None:
+            for elem in data: self.push(elem)
+        return
+
+    def size(self) -> int:
+        return len(self.hot) + self.spilled
+
+    def isEmpty(self) -> bool:
+        return self.size() == 0
+
+    # Write the oldest hot elements to the end of the spill file, O(segment_size)
+    def spill(self):
+        if self.file is None: self.file = tempfile.TemporaryFile(dir=self.dir)
+        # Pickle a copy and only drop the elements from memory once they are on
+        # disk, so an unpicklable element or a failed write loses nothing
+        block = list(itertools.islice(self.hot, self.segment_size))
+        payload = pickle.dumps(block, protocol=pickle.HIGHEST_PROTOCOL)
+        offset = self.stats.disk_bytes
+        self.file.seek(offset)
+        self.file.write(payload)
+        for _ in range(len(block)): self.hot.popleft()
+
+        self.segments.append((offset, len(payload), len(block)))
+        self.spilled += len(block)
+        self.stats.spills += 1
+        self.stats.bytes_spilled += len(payload)
+        self.stats.segments_on_disk += 1
+        self.stats.disk_bytes += len(payload)
+
+    # Read the newest block back into the (empty) hot segment, O(segment_size)
+    def reload(self):
+        # Only forget the segment once its elements are safely back in memory
+        offset, length, count = self.segments[-1]
+        self.file.seek(offset)
+        block = pickle.loads(self.file.read(length))
+        self.hot.extend(block)
+        self.segments.pop()
+        self.file.truncate(offset)
+
+        self.spilled -= count
+        self.stats.reloads += 1
+        self.stats.bytes_reloaded += length
+        self.stats.segments_on_disk -= 1
+        self.stats.disk_bytes = offset
+
+    def push(self, elem): # amortized O(1)
+        self.hot.append(elem)
+        if len(self.hot) > self.hot_limit: self.spill()
+
+    def pop(self): # pop and returns data at top, amortized O(1)
+        if not self.hot:
+            if not self.segments: raise Exception('Stack is empty already')
+            self.reload()
+        return self.hot.pop()
+
+    def peek(self): # peek data at top of Stack, amortized O(1)
+        if not self.hot:
+            if not self.segments: raise Exception('Cannot peek empty Stack')
+            self.reload()
+        return self.hot[-1]
+
+    # Drop everything, including the spill file
+    def clear(self):
+        self.hot.clear()
+        self.segments.clear()
+        self.spilled = 0
+        if self.file is not None: self.file.truncate(0)
+        self.stats.segments_on_disk = self.stats.disk_bytes = 0
+
+    # Close and delete the spill file
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.segments.clear()
+        self.spilled = 0
+        self.stats.segments_on_disk = self.stats.disk_bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __str__(self):
+        s = '[' + ', '.join(map(str, self.hot)) + '] <- top'
+        if self.spilled: s = f'[{self.spilled} on disk] ' + s
+        return s
+
+# testing
+def main():
+    with SpillStack(hot_limit=4, segment_size=2) as st:
+        print(st, st.size(), st.isEmpty())
+        for i in range(10):
+            st.push(i)
+        print(st, 'size', st.size())
+        print('stats:', st.stats)
+        print('peek', st.peek())
+        popped = [st.pop() for _ in range(7)]
+        print('popped', popped, st)
+        print('stats:', st.stats)
+        while not st.isEmpty(): st.pop()
+        print('emptied', st, st.stats.asDict())
+
+    # A deep DFS frame stack with a small memory budget
+    with SpillStack(hot_limit=10_000) as st:
+        n = 1_000_000
+        for i in range(n): st.push((i, i * 2))
+        print('after pushing', n, 'frames:', st.stats)
+        ok = all(st.pop() == (i, i * 2) for i in range(n - 1, -1, -1))
+        print('popped back in order?', ok, 'stats:', st.stats)
+
+if __name__ == "__main__":
+    main()
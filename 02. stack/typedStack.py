@@ -0,0 +1,178 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:     # NumPy is optional, array.array is always available
+    np = None
+
+'''
+A Stack of fixed-width numbers stored unboxed in a preallocated buffer.
+
+The buffer is an array.array (or a NumPy array with numpy=True) with 'top' marking
+the end of the live region. It doubles when full, which replaces the buffer rather
+than resizing it in place, so a memoryview returned by view() stays valid but stops
+tracking the stack once the buffer grows.
+
+TYPECODES FOR REFERENCE (array module)
+
+Typecode    C type              Bytes
+'b' / 'B'   signed/unsigned char    1
+'h' / 'H'   signed/unsigned short   2
+'i' / 'I'   signed/unsigned int     4
+'q' / 'Q'   signed/unsigned long long 8
+'f'         float                   4
+'d'         double                  8
+'''
+
+class TypedStack:
+
+    def __init__(self, typecode='q', data=None, capacity=16, numpy=False): # data is iterable
+        if capacity <= 0: raise ValueError('Capacity must be positive')
+        if numpy and np is None: raise ImportError('numpy=True requires NumPy to be installed')
+        self.typecode = typecode
+        self.numpy = numpy
+        self.top = 0
+        self.data = self.allocate(capacity)
+        if data is not None: self.pushMany(data)
+        return
+
+    def allocate(self, capacity):
+        if self.numpy: return np.empty(capacity, dtype=self.typecode)
+        return array(self.typecode, bytes(capacity * array(self.typecode).itemsize))
+
+    # Grow the buffer geometrically until 'needed' elements fit, O(n)
+    def reserve(self, needed: int):
+        capacity = len(self.data)
+        if needed <= capacity: return
+        while capacity < needed: capacity *= 2
+        data = self.allocate(capacity)
+        data[:self.top] = self.data[:self.top]
+        self.data = data
+
+    def size(self) -> int:
+        return self.top
+
+    def isEmpty(self) -> bool:
+        return self.top == 0
+
+    def capacity(self) -> int:
+        return len(self.data)
+
+    def push(self, elem): # amortized O(1)
+        if self.top == len(self.data): self.reserve(self.top + 1)
+        self.data[self.top] = elem
+        self.top += 1
+
+    def pop(self): # pop and returns data at top, O(1)
+        if self.top == 0: raise Exception('Stack is empty already')
+        self.top -= 1
+        return self.data[self.top]
+
+    def peek(self): # peek data at top of Stack, O(1)
+        if self.top == 0: raise Exception('Cannot peek empty Stack')
+        return self.data[self.top - 1]
+
+    # Push every element of an iterable, last one ends up on top, O(k)
+    def pushMany(self, elems):
+        if self.numpy: chunk = np.asarray(elems, dtype=self.typecode)
+        elif isinstance(elems, array) and elems.typecode == self.typecode: chunk = elems
+        else: chunk = array(self.typecode, elems)
+        k = len(chunk)
+        self.reserve(self.top + k)
+        self.data[self.top:self.top + k] = chunk
+        self.top += k
+
+    # Pop 'k' elements at once, returned in pop order (top first), O(k)
+    def popMany(self, k: int):
+        if k < 0: raise ValueError('Cannot pop a negative number of elements')
+        if k > self.top: raise Exception(f'Cannot pop {k} elements from a Stack of {self.top}')
+        chunk = self.data[self.top - k:self.top][::-1]
+        self.top -= k
+        return chunk.copy() if self.numpy else chunk
+
+    # Zero-copy view of the live region, bottom first
+    def view(self) -> memoryview:
+        return memoryview(self.data)[:self.top]
+
+    def clear(self):
+        self.top = 0
+
+    def __str__(self):
+        return '[' + ', '.join(str(self.data[i]) for i in range(self.top)) + '] <- top'
+
+# testing
+def main():
+    st1 = TypedStack()
+    st2 = TypedStack('d', [1.5, 2.5, 3.5], capacity=2)
+    print(f'sizes {st1.size()}, {st2.size()}, capacity of st2 {st2.capacity()}')
+    print(f'isEmpty? {st1.isEmpty()}, {st2.isEmpty()}')
+    print(st1)
+    print(st2)
+    st1.push(-1)
+    st2.pop()
+    print(f'peek st2: {st2.peek()}')
+    print(st1)
+    print(st2)
+
+    st1.pushMany(range(10))
+    print('after pushMany', st1, 'capacity', st1.capacity())
+    print('popMany(3)', st1.popMany(3).tolist())
+    v = st1.view()
+    print('view', v.format, v.tolist())
+
+    try:
+        st1.push(2 ** 70)
+    except OverflowError as e:
+        print('overflow:', e)
+
+    if np is not None:
+        st3 = TypedStack('int32', range(5), numpy=True)
+        print('numpy backed', st3, st3.popMany(2))
+
+
+# benchmark against the deque backed Stack
+def benchmark(n: int = 1_000_000, batch: int = 1_000):
+    import time
+    import tracemalloc
+    from stack import Stack
+
+    def memory(factory):
+        tracemalloc.start()
+        st = factory()
+        for i in range(n): st.push(i)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return used / n
+
+    def timed(work):
+        start = time.perf_counter()
+        work()
+        return time.perf_counter() - start
+
+    def single(st):
+        def work():
+            for i in range(n): st.push(i)
+            for _ in range(n): st.pop()
+        return work
+
+    def batched(st):
+        def work():
+            for i in range(0, n, batch): st.pushMany(range(i, i + batch))
+            for _ in range(0, n, batch): st.popMany(batch)
+        return work
+
+    def dequeBatched(st):
+        def work():
+            for i in range(0, n, batch): st.data.extend(range(i, i + batch))
+            for _ in range(0, n, batch):
+                for _ in range(batch): st.pop()
+        return work
+
+    print(f"{'':<24}{'Stack (deque)':>16}{'TypedStack':>14}")
+    print(f"{'bytes/elem':<24}{memory(Stack):>16.1f}{memory(TypedStack):>14.1f}")
+    print(f"{'push+pop one by one':<24}{timed(single(Stack())):>15.3f}s{timed(single(TypedStack())):>13.3f}s")
+    print(f"{f'batches of {batch}':<24}{timed(dequeBatched(Stack())):>15.3f}s{timed(batched(TypedStack())):>13.3f}s")
+
+if __name__ == "__main__":
+    main()
+    benchmark()
@@ -0,0 +1,164 @@
+import asyncio
+from collections import deque
+import time
+
+class AsyncQueue:
+    # Bounded FIFO queue for asyncio code. 'await offer()' suspends while the
+    # queue is full and 'await poll()' while it is empty, so producers are
+    # throttled by consumers (backpressure) without sleeping or spinning.
+    # Each waiter parks on its own future and every state change wakes exactly
+    # as many waiters as can make progress.
+
+    def __init__(self, max_size=10, data=None):
+        if max_size <= 0: raise ValueError('max_size must be positive')
+        self.max_size = max_size
+        self.data = deque()
+        self.getters = deque()      # futures of coroutines waiting for an element
+        self.putters = deque()      # futures of coroutines waiting for a free slot
+        if data is not None:
+            for elem in data: self.offerNowait(elem)
+        return
+
+    def size(self) -> int:
+        return len(self.data)
+
+    def isEmpty(self) -> bool:
+        return len(self.data) == 0
+
+    def isFull(self) -> bool:
+        return len(self.data) >= self.max_size
+
+    # Wake the first waiter that is still waiting
+    def wakeupNext(self, waiters):
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    # Park on a fresh future until woken; 'deadline' is a time.monotonic() value or None
+    async def wait(self, waiters, deadline):
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            if deadline is None:
+                await waiter
+            else:
+                await asyncio.wait_for(waiter, max(0, deadline - time.monotonic()))
+        except BaseException:
+            waiter.cancel()
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                # We were woken and then timed out or got cancelled before running,
+                # so pass the wakeup on rather than lose it
+                pass
+            else:
+                raise
+            if waiters is self.putters and not self.isFull(): self.wakeupNext(self.putters)
+            if waiters is self.getters and not self.isEmpty(): self.wakeupNext(self.getters)
+            raise
+
+    # admit elem to back of queue, raising if full
+    def offerNowait(self, elem):
+        if self.isFull(): raise RuntimeError('Queue is full')
+        self.data.append(elem)
+        self.wakeupNext(self.getters)
+
+    # remove elem from front of queue, raising if empty
+    def pollNowait(self):
+        if self.isEmpty(): raise RuntimeError('Queue is already empty')
+        elem = self.data.popleft()
+        self.wakeupNext(self.putters)
+        return elem
+
+    # admit elem to back of queue, waiting up to 'timeout' seconds for room
+    async def offer(self, elem, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.isFull():
+            await self.wait(self.putters, deadline)
+        self.offerNowait(elem)
+
+    # remove elem from front of queue, waiting up to 'timeout' seconds for one
+    async def poll(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.isEmpty():
+            await self.wait(self.getters, deadline)
+        return self.pollNowait()
+
+    # wait up to 'timeout' seconds for at least one elem, then take up to n at once
+    async def pollMany(self, n, timeout=None):
+        if n <= 0: raise ValueError('n must be positive')
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.isEmpty():
+            await self.wait(self.getters, deadline)
+        batch = [self.data.popleft() for _ in range(min(n, len(self.data)))]
+        for _ in batch: self.wakeupNext(self.putters)
+        # Anything left over belongs to the next consumer in line
+        if self.data: self.wakeupNext(self.getters)
+        return batch
+
+    # check the elem at front of the queue
+    def peek(self):
+        if self.isEmpty(): raise RuntimeError('Cannot peek empty queue')
+        return self.data[0]
+
+    def __str__(self):
+        return 'front -> [' + ', '.join(map(str, self.data)) + '] <- back'
+
+# testing
+def main():
+    async def demo():
+        q = AsyncQueue(max_size=3)
+        print("Initial queue:", q, "Empty?", q.isEmpty())
+
+        # Producer outruns the consumer and gets suspended on a full queue
+        log = []
+        async def producer():
+            for i in range(8):
+                await q.offer(i)
+                log.append(f'+{i}')
+        async def consumer():
+            for _ in range(4):
+                await asyncio.sleep(0.01)
+                log.append(f'-{await q.poll()}')
+            batch = await q.pollMany(10)
+            log.append(f'-{batch}')
+        await asyncio.gather(producer(), consumer())
+        print("Interleaving:", ' '.join(log))
+        print("Queue now:", q, "Size:", q.size())
+
+        while not q.isEmpty(): q.pollNowait()
+        print("Poll with timeout on empty queue:")
+        try:
+            await q.poll(timeout=0.05)
+        except TimeoutError:
+            print("  timed out")
+        await q.offer('x')
+        await q.offer('y')
+        await q.offer('z')
+        print("Offer with timeout on full queue:")
+        try:
+            await q.offer('w', timeout=0.05)
+        except TimeoutError:
+            print("  timed out")
+        print("Peek:", q.peek(), "pollMany(2):", await q.pollMany(2), q)
+
+        # Many producers, many consumers, every element delivered exactly once
+        q = AsyncQueue(max_size=16)
+        got = []
+        async def produce(base):
+            for i in range(1000): await q.offer(base + i)
+        async def consume():
+            while len(got) < 4000:
+                try:
+                    got.extend(await q.pollMany(8, timeout=0.1))
+                except TimeoutError:
+                    pass
+        await asyncio.gather(*(produce(k * 1000) for k in range(4)), *(consume() for _ in range(3)))
+        print("All delivered once?", sorted(got) == list(range(4000)))
+
+    asyncio.run(demo())
+
+if __name__ == "__main__":
+    main()
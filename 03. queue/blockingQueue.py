@@ -0,0 +1,169 @@
+from collections import deque
+import threading
+import time
+
+class BlockingQueue:
+    # Bounded FIFO queue safe to share between threads. One lock guards the
+    # deque; producers wait on 'not_full' and consumers on 'not_empty', so a
+    # thread is only woken when it can make progress. drain() hands over a whole
+    # batch per lock acquisition instead of one element.
+
+    def __init__(self, max_size=10, data=None):
+        if max_size <= 0: raise ValueError('max_size must be positive')
+        self.max_size = max_size
+        self.data = deque()
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        if data is not None:
+            for elem in data: self.offerNowait(elem)
+        return
+
+    def size(self) -> int:
+        return len(self.data)
+
+    def isEmpty(self) -> bool:
+        return len(self.data) == 0
+
+    def isFull(self) -> bool:
+        return len(self.data) >= self.max_size
+
+    # Wait on 'cond' until 'ready()' holds; False if 'timeout' seconds pass first.
+    # Must be called with the lock held.
+    def waitFor(self, cond, ready, timeout) -> bool:
+        if ready(): return True
+        if timeout is not None and timeout <= 0: return False
+        return cond.wait_for(ready, timeout)
+
+    # admit elem to back of queue, raising if full
+    def offerNowait(self, elem):
+        with self.lock:
+            if len(self.data) >= self.max_size: raise RuntimeError('Queue is full')
+            self.data.append(elem)
+            self.not_empty.notify()
+
+    # admit elem to back of queue, waiting up to 'timeout' seconds (None = forever) for room
+    def offer(self, elem, timeout=None):
+        with self.lock:
+            if not self.waitFor(self.not_full, lambda: len(self.data) < self.max_size, timeout):
+                raise TimeoutError('Timed out waiting for room in the queue')
+            self.data.append(elem)
+            self.not_empty.notify()
+
+    # remove elem from front of queue, raising if empty
+    def pollNowait(self):
+        with self.lock:
+            if not self.data: raise RuntimeError('Queue is already empty')
+            elem = self.data.popleft()
+            self.not_full.notify()
+            return elem
+
+    # remove elem from front of queue, waiting up to 'timeout' seconds (None = forever) for one
+    def poll(self, timeout=None):
+        with self.lock:
+            if not self.waitFor(self.not_empty, lambda: len(self.data) > 0, timeout):
+                raise TimeoutError('Timed out waiting for an element')
+            elem = self.data.popleft()
+            self.not_full.notify()
+            return elem
+
+    # Wait up to 'timeout' seconds for at least one elem, then take up to
+    # 'max_items' in the same lock acquisition. Returns [] on timeout.
+    def drain(self, max_items, timeout=None) -> list:
+        if max_items <= 0: raise ValueError('max_items must be positive')
+        with self.lock:
+            if not self.waitFor(self.not_empty, lambda: len(self.data) > 0, timeout): return []
+            data = self.data
+            batch = [data.popleft() for _ in range(min(max_items, len(data)))]
+            self.not_full.notify(len(batch))
+            # Leftovers are for the next consumer in line
+            if data: self.not_empty.notify()
+            return batch
+
+    # check the elem at front of the queue
+    def peek(self):
+        with self.lock:
+            if not self.data: raise RuntimeError('Cannot peek empty queue')
+            return self.data[0]
+
+    def __str__(self):
+        with self.lock:
+            return 'front -> [' + ', '.join(map(str, self.data)) + '] <- back'
+
+# testing
+def main():
+    q = BlockingQueue(max_size=3)
+    print("Initial queue:", q, "Empty?", q.isEmpty(), "Full?", q.isFull())
+    q.offer(10)
+    q.offer(20)
+    q.offer(30)
+    print(q, "Full?", q.isFull(), "Peek:", q.peek())
+
+    print("Offer with timeout on full queue:")
+    try:
+        q.offer(40, timeout=0.05)
+    except TimeoutError as e:
+        print(" ", e)
+
+    # A consumer frees a slot while the producer is blocked
+    threading.Timer(0.05, q.poll).start()
+    q.offer(40, timeout=1)
+    print("After blocked offer:", q)
+    print("drain(2):", q.drain(2), q)
+    print("drain(5):", q.drain(5), q)
+    print("drain on empty with timeout:", q.drain(5, timeout=0.05))
+    try:
+        q.poll(timeout=0.05)
+    except TimeoutError as e:
+        print("Poll:", e)
+
+    # Every element delivered exactly once across several producers and consumers
+    q = BlockingQueue(max_size=64)
+    got, got_lock, done = [], threading.Lock(), threading.Event()
+    def produce(base):
+        for i in range(5_000): q.offer(base + i)
+    def consume():
+        while not (done.is_set() and q.isEmpty()):
+            batch = q.drain(32, timeout=0.01)
+            with got_lock: got.extend(batch)
+    producers = [threading.Thread(target=produce, args=(k * 5_000,)) for k in range(4)]
+    consumers = [threading.Thread(target=consume) for _ in range(3)]
+    for t in producers + consumers: t.start()
+    for t in producers: t.join()
+    done.set()
+    for t in consumers: t.join()
+    print("All delivered once?", sorted(got) == list(range(20_000)))
+
+
+# benchmark: producer/consumer throughput for thread counts and drain batch sizes
+def benchmark(n: int = 200_000, threads=(1, 2, 4), batches=(1, 16, 256), max_size=1_024):
+    def run(k, batch):
+        q = BlockingQueue(max_size=max_size)
+        done = threading.Event()
+        per = n // k
+        def produce():
+            for i in range(per): q.offer(i)
+        def consume():
+            while not (done.is_set() and q.isEmpty()):
+                if batch == 1:
+                    try: q.poll(timeout=0.01)
+                    except TimeoutError: pass
+                else:
+                    q.drain(batch, timeout=0.01)
+        producers = [threading.Thread(target=produce) for _ in range(k)]
+        consumers = [threading.Thread(target=consume) for _ in range(k)]
+        start = time.perf_counter()
+        for t in producers + consumers: t.start()
+        for t in producers: t.join()
+        done.set()
+        for t in consumers: t.join()
+        return per * k / (time.perf_counter() - start)
+
+    print(f"{'producers=consumers':>20}" + ''.join(f"{f'batch {b}':>14}" for b in batches))
+    for k in threads:
+        print(f"{k:>20}" + ''.join(f"{run(k, b):>14,.0f}" for b in batches))
+    print("(items/sec; batch 1 uses poll(), larger batches use drain())")
+
+if __name__ == "__main__":
+    main()
+    benchmark()
@@ -0,0 +1,136 @@
+from collections import deque
+
+class MonotonicQueue:
+    # Sliding-window minimum and maximum in O(1) amortized per element.
+    #
+    # Values arrive with an increasing key (their index, or a timestamp) and old
+    # ones are evicted by key. Two deques keep only the candidates that can still
+    # become the answer: 'mins' holds values in increasing order, 'maxs' in
+    # decreasing order. A new value first drops every candidate it beats from
+    # the back, so each value enters and leaves each deque at most once.
+
+    def __init__(self):
+        self.mins = deque()     # (key, value), values increasing from front to back
+        self.maxs = deque()     # (key, value), values decreasing from front to back
+        self.next_key = 0       # key used when push() is not given one
+        return
+
+    def isEmpty(self) -> bool:
+        return len(self.maxs) == 0
+
+    # admit a value to the back of the window; 'key' defaults to a running index
+    def push(self, value, key=None):
+        if key is None: key = self.next_key
+        elif self.maxs and key < self.maxs[-1][0]: raise ValueError('Keys must not decrease')
+        self.next_key = key + 1
+
+        mins = self.mins
+        while mins and mins[-1][1] >= value: mins.pop()
+        mins.append((key, value))
+        maxs = self.maxs
+        while maxs and maxs[-1][1] <= value: maxs.pop()
+        maxs.append((key, value))
+
+    # drop every value whose key is strictly smaller than 'key'
+    def evictOlderThan(self, key):
+        mins = self.mins
+        while mins and mins[0][0] < key: mins.popleft()
+        maxs = self.maxs
+        while maxs and maxs[0][0] < key: maxs.popleft()
+
+    # smallest value in the window, O(1)
+    def min(self):
+        if not self.mins: raise RuntimeError('Cannot take min of empty window')
+        return self.mins[0][1]
+
+    # largest value in the window, O(1)
+    def max(self):
+        if not self.maxs: raise RuntimeError('Cannot take max of empty window')
+        return self.maxs[0][1]
+
+    def clear(self):
+        self.mins.clear()
+        self.maxs.clear()
+
+    def __str__(self):
+        return f'min candidates {[v for _, v in self.mins]}, max candidates {[v for _, v in self.maxs]}'
+
+
+# Minimum and maximum of every full window of 'window' consecutive values in
+# one pass, O(n). Returns (mins, maxs), each of length len(values) - window + 1.
+def slidingWindowExtrema(values, window: int):
+    if window <= 0: raise ValueError('window must be positive')
+    mins, maxs = [], []
+    lo, hi = deque(), deque()   # indices whose values are increasing / decreasing
+    for i, value in enumerate(values):
+        while lo and values[lo[-1]] >= value: lo.pop()
+        lo.append(i)
+        while hi and values[hi[-1]] <= value: hi.pop()
+        hi.append(i)
+        start = i - window + 1
+        if start < 0: continue
+        if lo[0] < start: lo.popleft()
+        if hi[0] < start: hi.popleft()
+        mins.append(values[lo[0]])
+        maxs.append(values[hi[0]])
+    return mins, maxs
+
+# testing
+def main():
+    q = MonotonicQueue()
+    print("Empty?", q.isEmpty())
+    stream = [4, 2, 12, 3, 8, 1, 7, 5]
+    window = 3
+    for i, x in enumerate(stream):
+        q.push(x)
+        q.evictOlderThan(i - window + 1)
+        if i >= window - 1:
+            print(f"window {stream[i - window + 1:i + 1]}: min {q.min()}, max {q.max()}")
+    print(q)
+
+    print("Timestamped readings, keep the last 10 seconds:")
+    q = MonotonicQueue()
+    for t, reading in [(0.0, 20.5), (3.2, 21.0), (7.9, 19.8), (12.5, 22.4), (15.0, 18.1)]:
+        q.push(reading, key=t)
+        q.evictOlderThan(t - 10)
+        print(f"  t={t:>4}: min {q.min()}, max {q.max()}")
+
+    print("Whole array helper:")
+    mins, maxs = slidingWindowExtrema(stream, window)
+    print("  mins", mins)
+    print("  maxs", maxs)
+
+
+# benchmark against rescanning a Queue of the window
+def benchmark(n: int = 100_000, windows=(10, 100, 1_000)):
+    import random
+    import time
+    from queue import Queue
+
+    values = [random.random() for _ in range(n)]
+    print(f"{'window':>8}{'rescan Queue':>14}{'MonotonicQueue':>16}{'one-pass helper':>17}")
+    for w in windows:
+        start = time.perf_counter()
+        q = Queue(max_size=w)
+        for x in values:
+            if q.isFull(): q.poll()
+            q.offer(x)
+            min(q.data), max(q.data)
+        rescan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mq = MonotonicQueue()
+        for i, x in enumerate(values):
+            mq.push(x)
+            mq.evictOlderThan(i - w + 1)
+            mq.min(), mq.max()
+        mono = time.perf_counter() - start
+
+        start = time.perf_counter()
+        slidingWindowExtrema(values, w)
+        helper = time.perf_counter() - start
+        print(f"{w:>8}{rescan:>13.3f}s{mono:>15.3f}s{helper:>16.3f}s")
+
+if __name__ == "__main__":
+    main()
+    benchmark()
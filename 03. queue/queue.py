@@ -1,14 +1,123 @@
 from collections import deque
+import random
+import threading
+import time
+
+class QueueMetrics:
+    # Opt-in instrumentation for a Queue: enqueue timestamps, a histogram of the
+    # time elements spend queued, depth over time, high-water mark and offer/poll
+    # rates. Timestamps live in a deque kept in step with the queue's own, so
+    # ring-buffer drops evict the matching timestamp too.
+
+    BUCKETS = 48        # wait-time buckets: bucket i counts waits below 2**i microseconds
+
+    def __init__(self, maxlen=None, depth=0, sample_interval=0.01, max_samples=1024):
+        now = time.perf_counter()
+        self.started = now
+        self.enqueued_at = deque([now] * depth, maxlen)    # timestamp of every queued elem, front first
+        self.offers = 0
+        self.polls = 0
+
+        self.wait_buckets = [0] * QueueMetrics.BUCKETS
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+        self.depth = depth
+        self.high_water = depth
+        self.depth_area = 0.0                              # integral of depth over time, for the mean
+        self.last_change = now
+        self.sample_interval = sample_interval
+        self.depth_samples = deque([(0.0, depth)], max_samples)   # (seconds since start, depth)
+        self.last_sample = now
+        return
+
+    # called after an elem was admitted; 'depth' is the queue size afterwards
+    def offered(self, depth):
+        now = time.perf_counter()
+        self.enqueued_at.append(now)
+        self.offers += 1
+        if depth > self.high_water: self.high_water = depth
+        self.record(now, depth)
+
+    # called after an elem was removed from the front
+    def polled(self, depth):
+        now = time.perf_counter()
+        wait = now - self.enqueued_at.popleft()
+        self.polls += 1
+        self.wait_buckets[min(int(wait * 1_000_000).bit_length(), QueueMetrics.BUCKETS - 1)] += 1
+        self.wait_total += wait
+        if wait > self.wait_max: self.wait_max = wait
+        self.record(now, depth)
+
+    def record(self, now, depth):
+        self.depth_area += self.depth * (now - self.last_change)
+        self.depth = depth
+        self.last_change = now
+        if now - self.last_sample >= self.sample_interval:
+            self.depth_samples.append((now - self.started, depth))
+            self.last_sample = now
+
+    # upper bound in seconds of the bucket holding the p-th quantile of wait times
+    def waitPercentile(self, p) -> float:
+        if self.polls == 0: return 0.0
+        rank, seen = p * self.polls, 0
+        for i, count in enumerate(self.wait_buckets):
+            seen += count
+            if seen >= rank: return min((1 << i) / 1_000_000, self.wait_max)
+        return self.wait_max
+
+    def asDict(self) -> dict:
+        now = time.perf_counter()
+        elapsed = max(now - self.started, 1e-9)
+        area = self.depth_area + self.depth * (now - self.last_change)
+        return {
+            'elapsed_s': elapsed,
+            'offers': self.offers,
+            'polls': self.polls,
+            'offer_rate': self.offers / elapsed,
+            'poll_rate': self.polls / elapsed,
+            'depth': self.depth,
+            'high_water': self.high_water,
+            'mean_depth': area / elapsed,
+            'wait_mean_s': self.wait_total / self.polls if self.polls else 0.0,
+            'wait_max_s': self.wait_max,
+            'wait_p50_s': self.waitPercentile(0.5),
+            'wait_p99_s': self.waitPercentile(0.99),
+            'wait_histogram_us': {1 << i: c for i, c in enumerate(self.wait_buckets) if c},
+            'depth_samples': list(self.depth_samples),
+        }
+
 
 class Queue:
 
+    # What offer() does when the queue is full
+    RAISE = 'raise'                 # raise RuntimeError (default)
+    DROP_NEWEST = 'drop_newest'     # discard the incoming element
+    DROP_OLDEST = 'drop_oldest'     # ring buffer: discard the element at the front
+    BLOCK = 'block'                 # wait for another thread to poll
+    SAMPLE = 'sample'               # admit with probability sample_rate by dropping the oldest
+    POLICIES = (RAISE, DROP_NEWEST, DROP_OLDEST, BLOCK, SAMPLE)
 
-    def __init__(self, max_size=10, data=None):
+    def __init__(self, max_size=10, data=None, policy=RAISE, sample_rate=0.1, instrument=False):
+        if policy not in Queue.POLICIES: raise ValueError(f'Unknown overflow policy {policy!r}')
+        if not 0 <= sample_rate <= 1: raise ValueError('sample_rate must be in [0, 1]')
         self.max_size = max_size
+        self.policy = policy
+        self.sample_rate = sample_rate
         if data is None:
             self.data = deque([], max_size)
         else:
             self.data = deque(data, max_size)
+
+        # Load shedding counters
+        self.accepted = 0
+        self.dropped = 0
+
+        # Only the blocking policy needs to coordinate threads
+        self.not_full = threading.Condition() if policy == Queue.BLOCK else None
+
+        # Opt-in instrumentation; when off it costs one attribute check per offer/poll
+        self.metrics = QueueMetrics(self.data.maxlen, len(self.data)) if instrument else None
         return
     
     def size(self) -> int:
@@ -20,15 +129,61 @@ class Queue:
     def isFull(self) -> bool:
         return len(self.data) == self.data.maxlen
 
-    # admit elem to back of queue i.e. add to rear
-    def offer(self, elem):
-        if self.isFull(): raise RuntimeError('Queue is full')
+    # admit elem to back of queue i.e. add to rear. When full, the overflow
+    # policy decides; returns whether elem was admitted. 'timeout' (seconds)
+    # only applies to the blocking policy.
+    def offer(self, elem, timeout=None) -> bool:
+        if self.not_full is not None: return self.offerBlocking(elem, timeout)
+        if len(self.data) != self.data.maxlen:
+            self.data.append(elem)
+            self.accepted += 1
+            if self.metrics is not None: self.metrics.offered(len(self.data))
+            return True
+
+        policy = self.policy
+        if policy == Queue.RAISE:
+            self.dropped += 1
+            raise RuntimeError('Queue is full')
+        if policy == Queue.DROP_NEWEST or (policy == Queue.SAMPLE and random.random() >= self.sample_rate):
+            self.dropped += 1
+            return False
+        # DROP_OLDEST, or a sampled element: the deque's maxlen pushes the front out
         self.data.append(elem)
+        self.accepted += 1
+        self.dropped += 1
+        if self.metrics is not None: self.metrics.offered(len(self.data))
+        return True
+
+    # Wait until there is room, or raise TimeoutError after 'timeout' seconds
+    def offerBlocking(self, elem, timeout) -> bool:
+        with self.not_full:
+            if not self.not_full.wait_for(lambda: len(self.data) != self.data.maxlen, timeout):
+                self.dropped += 1
+                raise TimeoutError('Timed out waiting for room in the queue')
+            self.data.append(elem)
+            self.accepted += 1
+            if self.metrics is not None: self.metrics.offered(len(self.data))
+        return True
 
     # remove elem from front of queue i.e. remove from front
     def poll(self): # returns elem
+        if self.not_full is not None:
+            with self.not_full:
+                if self.isEmpty(): raise RuntimeError('Queue is already empty')
+                elem = self.data.popleft()
+                if self.metrics is not None: self.metrics.polled(len(self.data))
+                self.not_full.notify()
+                return elem
         if self.isEmpty(): raise RuntimeError('Queue is already empty')
-        return self.data.popleft()
+        elem = self.data.popleft()
+        if self.metrics is not None: self.metrics.polled(len(self.data))
+        return elem
+
+    # Load shedding counters, plus the instrumentation if enabled, as a plain dict
+    def stats(self) -> dict:
+        stats = {'policy': self.policy, 'accepted': self.accepted, 'dropped': self.dropped}
+        if self.metrics is not None: stats.update(self.metrics.asDict())
+        return stats
     
     # check the elem at front of the queue
     def peek(self):
@@ -87,6 +242,47 @@ def main():
     print(q)
     print("Empty?", q.isEmpty())
 
+    print()
+
+    print("Overflow policies on a queue of 3, offering 0..9:")
+    for policy in Queue.POLICIES:
+        if policy == Queue.BLOCK: continue
+        q = Queue(max_size=3, policy=policy, sample_rate=0.5)
+        for i in range(10):
+            try:
+                q.offer(i)
+            except RuntimeError:
+                pass
+        print(f"  {policy:<12}", q, q.stats())
+
+    print("Blocking policy: a consumer thread makes room")
+    q = Queue(max_size=2, policy=Queue.BLOCK)
+    q.offer(1)
+    q.offer(2)
+    threading.Timer(0.05, q.poll).start()
+    start = time.perf_counter()
+    q.offer(3)
+    print(f"  offer waited {time.perf_counter() - start:.2f}s", q, q.stats())
+    try:
+        q.offer(4, timeout=0.05)
+    except TimeoutError as e:
+        print(" ", e, q.stats())
+
+    print()
+
+    print("Instrumented queue:")
+    q = Queue(max_size=8, instrument=True)
+    for i in range(6):
+        q.offer(i)
+        time.sleep(0.002)
+    for _ in range(4): q.poll()
+    stats = q.stats()
+    print(f"  high water {stats['high_water']}, mean depth {stats['mean_depth']:.2f}, "
+          f"offers {stats['offers']} polls {stats['polls']}")
+    print(f"  wait mean {stats['wait_mean_s'] * 1000:.1f}ms, p50 <= {stats['wait_p50_s'] * 1000:.1f}ms, "
+          f"max {stats['wait_max_s'] * 1000:.1f}ms")
+    print("  wait histogram (upper bound us: count):", stats['wait_histogram_us'])
+
     # Uncomment these one at a time to test error cases
     # q.poll()          # should raise RuntimeError (empty)
     # q.peek()          # should raise RuntimeError (empty)
@@ -95,5 +291,33 @@ def main():
     # q.offer(70)
     # q.offer(80)       # should raise RuntimeError (full)
 
+# benchmark: offering into a saturated queue under each policy
+def benchmark(n: int = 500_000):
+    print(f"{'policy':<14}{'offers/sec':>12}{'accepted':>10}{'dropped':>10}")
+    for policy in Queue.POLICIES:
+        if policy == Queue.BLOCK: continue
+        q = Queue(max_size=100, policy=policy)
+        for i in range(100): q.offer(i)
+        start = time.perf_counter()
+        for i in range(n):
+            try:
+                q.offer(i)
+            except RuntimeError:
+                pass
+        elapsed = time.perf_counter() - start
+        print(f"{policy:<14}{n / elapsed:>12,.0f}{q.accepted:>10,}{q.dropped:>10,}")
+
+    print()
+    print(f"{'instrument':<14}{'offer+poll/sec':>16}")
+    for instrument in (False, True):
+        q = Queue(max_size=1_000, instrument=instrument)
+        start = time.perf_counter()
+        for i in range(n // 1_000):
+            for j in range(1_000): q.offer(j)
+            for j in range(1_000): q.poll()
+        elapsed = time.perf_counter() - start
+        print(f"{str(instrument):<14}{n / elapsed:>16,.0f}")
+
 if __name__ == "__main__":
     main()
+    benchmark()
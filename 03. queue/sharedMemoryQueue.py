@@ -0,0 +1,255 @@
+from multiprocessing import shared_memory
+import struct
+import time
+
+class SharedMemoryQueue:
+    # Bounded FIFO ring buffer of fixed-width records living in a
+    # multiprocessing.shared_memory block, so processes hand records over
+    # without pickling or copying them through a pipe.
+    #
+    # Layout: a header of four uint64 (head, tail, capacity, record_size)
+    # followed by 'capacity' slots of 'record_size' bytes. head and tail only
+    # ever grow; a record sits in slot (counter % capacity). With one producer
+    # and one consumer only the producer writes tail and only the consumer
+    # writes head, so no lock is needed. For several producers or consumers
+    # pass a multiprocessing.Lock() as 'lock' and share it with every process.
+
+    HEADER = 4 * 8
+
+    def __init__(self, capacity=1024, record_size=None, fmt=None, name=None, lock=None, create=True):
+        # 'fmt' is an optional struct format; records are then tuples packed
+        # with it, otherwise raw bytes of exactly 'record_size' bytes.
+        self.fmt = fmt
+        if fmt is not None: record_size = struct.calcsize(fmt)
+        if create:
+            if capacity <= 0: raise ValueError('capacity must be positive')
+            if record_size is None or record_size <= 0: raise ValueError('record_size must be positive')
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.HEADER + capacity * record_size)
+            self.header = self.shm.buf[:self.HEADER].cast('Q')
+            self.header[0] = self.header[1] = 0
+            self.header[2] = capacity
+            self.header[3] = record_size
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.header = self.shm.buf[:self.HEADER].cast('Q')
+        self.capacity = self.header[2]
+        self.record_size = self.header[3]
+        if fmt is not None and struct.calcsize(fmt) != self.record_size:
+            raise ValueError(f'fmt {fmt!r} does not match the record size {self.record_size}')
+        self.slots = self.shm.buf[self.HEADER:self.HEADER + self.capacity * self.record_size]
+        self.lock = lock
+        return
+
+    # Open a queue created by another process by its shared memory name
+    @classmethod
+    def attach(cls, name, fmt=None, lock=None):
+        return cls(name=name, fmt=fmt, lock=lock, create=False)
+
+    # Sent to a spawned process by name; it re-attaches to the same block
+    def __reduce__(self):
+        return (SharedMemoryQueue.attach, (self.shm.name, self.fmt, self.lock))
+
+    def name(self) -> str:
+        return self.shm.name
+
+    def size(self) -> int:
+        return self.header[1] - self.header[0]
+
+    def isEmpty(self) -> bool:
+        return self.header[1] == self.header[0]
+
+    def isFull(self) -> bool:
+        return self.header[1] - self.header[0] == self.capacity
+
+    def offset(self, counter) -> int:
+        return (counter % self.capacity) * self.record_size
+
+    # admit a record to back of queue i.e. add to rear
+    def offer(self, record):
+        if self.lock is not None:
+            with self.lock: self.offerUnlocked(record)
+        else:
+            self.offerUnlocked(record)
+
+    def offerUnlocked(self, record):
+        tail = self.header[1]
+        if tail - self.header[0] == self.capacity: raise RuntimeError('Queue is full')
+        start = self.offset(tail)
+        if self.fmt is not None:
+            struct.pack_into(self.fmt, self.slots, start, *record)
+        else:
+            if len(record) != self.record_size: raise ValueError(f'Records must be {self.record_size} bytes')
+            self.slots[start:start + self.record_size] = record
+        # Publish only after the slot is written
+        self.header[1] = tail + 1
+
+    # remove a record from front of queue i.e. remove from front
+    def poll(self): # returns record
+        if self.lock is not None:
+            with self.lock: return self.pollUnlocked()
+        return self.pollUnlocked()
+
+    def pollUnlocked(self):
+        head = self.header[0]
+        if head == self.header[1]: raise RuntimeError('Queue is already empty')
+        record = self.read(head)
+        # Hand the slot back only after it has been read
+        self.header[0] = head + 1
+        return record
+
+    def read(self, counter):
+        start = self.offset(counter)
+        if self.fmt is not None: return struct.unpack_from(self.fmt, self.slots, start)
+        return bytes(self.slots[start:start + self.record_size])
+
+    # check the record at front of the queue
+    def peek(self):
+        if self.lock is not None:
+            with self.lock: return self.peekUnlocked()
+        return self.peekUnlocked()
+
+    def peekUnlocked(self):
+        head = self.header[0]
+        if head == self.header[1]: raise RuntimeError('Cannot peek empty queue')
+        return self.read(head)
+
+    # Contiguous memoryviews over up to 'max_items' slots starting at counter
+    # 'start' (two views when the run wraps around the end of the ring)
+    def views(self, start, count):
+        first = min(count, self.capacity - start % self.capacity)
+        views = [self.slots[self.offset(start):self.offset(start) + first * self.record_size]]
+        if count > first: views.append(self.slots[:(count - first) * self.record_size])
+        return views
+
+    # Zero-copy access to up to 'max_items' readable records, oldest first.
+    # Returns (count, views); call advanceRead(count) when done with them.
+    # In lock mode, hold q.lock from readSlots() until advanceRead().
+    def readSlots(self, max_items):
+        count = min(max_items, self.size())
+        if count == 0: return 0, []
+        return count, self.views(self.header[0], count)
+
+    # Release 'count' records obtained from readSlots()
+    def advanceRead(self, count):
+        if count > self.size(): raise ValueError('Cannot release more records than are queued')
+        self.header[0] += count
+
+    # Zero-copy access to up to 'max_items' free slots at the back. Fill them,
+    # then call advanceWrite(count) to publish. In lock mode, hold q.lock throughout.
+    def writeSlots(self, max_items):
+        count = min(max_items, self.capacity - self.size())
+        if count == 0: return 0, []
+        return count, self.views(self.header[1], count)
+
+    # Publish 'count' records written through writeSlots()
+    def advanceWrite(self, count):
+        if count > self.capacity - self.size(): raise ValueError('Cannot publish more slots than are free')
+        self.header[1] += count
+
+    # Detach from the shared memory; views from readSlots()/writeSlots() must be released first
+    def close(self):
+        self.slots.release()
+        self.header.release()
+        self.shm.close()
+
+    # Destroy the shared memory block; call once, from the creating process
+    def unlink(self):
+        self.shm.unlink()
+
+    def __str__(self):
+        if self.lock is not None:
+            with self.lock: return self.strUnlocked()
+        return self.strUnlocked()
+
+    def strUnlocked(self):
+        head, tail = self.header[0], self.header[1]
+        return 'front -> [' + ', '.join(str(self.read(i)) for i in range(head, tail)) + '] <- back'
+
+# Producers for the demo. They live at module level so that spawn and
+# forkserver start methods can pickle them; the queue travels by name and
+# each producer detaches from it when done.
+def produce(q, n):
+    i = 0
+    while i < n:
+        try:
+            q.offer((i,))
+            i += 1
+        except RuntimeError:
+            time.sleep(0)
+    q.close()
+
+def produceBytes(q, base, n):
+    i = 0
+    while i < n:
+        try:
+            q.offer((base + i).to_bytes(8, 'little'))
+            i += 1
+        except RuntimeError:
+            time.sleep(0)
+    q.close()
+
+# testing
+def main():
+    import multiprocessing as mp
+
+    q = SharedMemoryQueue(capacity=3, fmt='qd')
+    print("Initial queue:", q, "Empty?", q.isEmpty(), "Full?", q.isFull())
+    q.offer((1, 0.5))
+    q.offer((2, 1.5))
+    q.offer((3, 2.5))
+    print(q, "Full?", q.isFull(), "Peek:", q.peek())
+    try:
+        q.offer((4, 3.5))
+    except RuntimeError as e:
+        print("Offer on full queue:", e)
+    print("Polled:", q.poll(), q)
+    q.offer((4, 3.5))     # wraps around the ring
+    print(q, "Size:", q.size())
+
+    count, views = q.readSlots(10)
+    print("Zero-copy batch of", count, "records in", len(views), "views:",
+          [struct.unpack('qd', v[i:i + q.record_size]) for v in views for i in range(0, len(v), q.record_size)])
+    for v in views: v.release()
+    q.advanceRead(count)
+    print("After advanceRead:", q, "Empty?", q.isEmpty())
+    q.close()
+    q.unlink()
+
+    # Producer in a child process, consumer here
+    q = SharedMemoryQueue(capacity=256, fmt='q')
+    n = 100_000
+    child = mp.Process(target=produce, args=(q, n))
+    start = time.perf_counter()
+    child.start()
+    expected = 0
+    while expected < n:
+        try:
+            (value,) = q.poll()
+        except RuntimeError:
+            time.sleep(0)
+            continue
+        assert value == expected
+        expected += 1
+    child.join()
+    print(f"Cross-process SPSC: {n:,} records in order, {n / (time.perf_counter() - start):,.0f} records/sec")
+    q.close()
+    q.unlink()
+
+    # Several producers sharing a lock
+    lock = mp.Lock()
+    q = SharedMemoryQueue(capacity=64, record_size=8, lock=lock)
+    children = [mp.Process(target=produceBytes, args=(q, k * 10_000, 10_000)) for k in range(3)]
+    for c in children: c.start()
+    got = []
+    while len(got) < 30_000:
+        try:
+            got.append(int.from_bytes(q.poll(), 'little'))
+        except RuntimeError:
+            time.sleep(0)
+    for c in children: c.join()
+    print("MPMC with lock: all delivered once?", sorted(got) == list(range(30_000)))
+    q.close()
+    q.unlink()
+
+if __name__ == "__main__":
+    main()
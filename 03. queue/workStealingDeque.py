@@ -0,0 +1,396 @@
+from collections import deque
+import multiprocessing as mp
+import random
+import threading
+import time
+
+class WorkStealingDeque:
+    # Per-worker task deque. The owning worker pushes and pops at the bottom
+    # (LIFO, so it keeps working on the freshest, cache-warm subtask) while idle
+    # workers steal from the top, where the oldest and usually largest pieces
+    # of work sit. Owner and thieves touch opposite ends, so they rarely meet.
+    #
+    # collections.deque's append/pop/popleft are atomic under the GIL, which
+    # gives the same guarantees as a lock-free Chase-Lev deque: any number of
+    # thieves may call steal() concurrently with the owner's push()/pop().
+
+    def __init__(self, data=None):
+        self.data = deque() if data is None else deque(data)
+        self.steals = 0         # successful steals from this deque
+        return
+
+    def size(self) -> int:
+        return len(self.data)
+
+    def isEmpty(self) -> bool:
+        return len(self.data) == 0
+
+    # owner: add a task at the bottom
+    def push(self, task):
+        self.data.append(task)
+
+    # owner: take the newest task, or 'default' if there is none
+    def popOr(self, default=None):
+        try:
+            return self.data.pop()
+        except IndexError:
+            return default
+
+    # thief: take the oldest task, or 'default' if there is none
+    def stealOr(self, default=None):
+        try:
+            task = self.data.popleft()
+        except IndexError:
+            return default
+        self.steals += 1
+        return task
+
+    def pop(self):
+        if not self.data: raise RuntimeError('Deque is already empty')
+        return self.data.pop()
+
+    def steal(self):
+        if not self.data: raise RuntimeError('Nothing to steal')
+        self.steals += 1
+        return self.data.popleft()
+
+    def __str__(self):
+        return 'top -> [' + ', '.join(map(str, self.data)) + '] <- bottom'
+
+
+class Task:
+    # A unit of work forked onto a scheduler; join() it for the result
+    __slots__ = ('fn', 'args', 'result', 'error', 'done')
+
+    def __init__(self, fn, args):
+        self.fn = fn
+        self.args = args
+        self.result = None
+        self.error = None
+        self.done = False
+
+    def run(self):
+        try:
+            self.result = self.fn(*self.args)
+        except BaseException as e:
+            self.error = e
+        self.done = True
+
+
+class Scheduler:
+    # Fork/join scheduler over a pool of worker threads, one WorkStealingDeque
+    # each. A running task calls fork() to push subtasks onto its own worker's
+    # deque and join() to wait for them; while waiting, the worker keeps running
+    # tasks from its deque (usually the one it is joining) or steals from a
+    # random victim, so no thread ever sits blocked on unfinished work.
+    #
+    # mode='process' runs map() on forked worker processes instead, each owning
+    # a range of indices in a SharedRangeDeque and stealing half a range at a time.
+
+    IDLE_SPINS = 64         # failed steal rounds before an idle worker naps
+
+    def __init__(self, workers=4, mode='thread'):
+        if workers <= 0: raise ValueError('workers must be positive')
+        if mode not in ('thread', 'process'): raise ValueError(f'Unknown mode {mode!r}')
+        self.workers = workers
+        self.mode = mode
+        self.local = threading.local()      # .index of the worker running on this thread
+        self.idle = threading.Condition()
+        self.sleepers = 0
+        self.running = False
+        self.threads = []
+        if mode == 'thread': self.start()
+        return
+
+    # hooks where a subclass can swap the task storage
+    def setupDeques(self):
+        self.deques = [WorkStealingDeque() for _ in range(self.workers)]
+
+    def submit(self, index, task):
+        self.deques[index].push(task)
+
+    def findTask(self, index):
+        task = self.deques[index].popOr()
+        if task is not None: return task
+        # Start at a random victim so thieves spread out
+        offset = random.randrange(self.workers)
+        for k in range(self.workers):
+            victim = (offset + k) % self.workers
+            if victim == index: continue
+            task = self.deques[victim].stealOr()
+            if task is not None: return task
+        return None
+
+    def start(self):
+        self.setupDeques()
+        self.running = True
+        self.threads = [threading.Thread(target=self.work, args=(i,), daemon=True) for i in range(self.workers)]
+        for t in self.threads: t.start()
+
+    def work(self, index):
+        self.local.index = index
+        spins = 0
+        while self.running:
+            task = self.findTask(index)
+            if task is not None:
+                task.run()
+                spins = 0
+                continue
+            spins += 1
+            if spins < Scheduler.IDLE_SPINS:
+                time.sleep(0)
+                continue
+            # Nap until someone forks new work; the timeout covers a missed wakeup
+            with self.idle:
+                self.sleepers += 1
+                self.idle.wait(0.001)
+                self.sleepers -= 1
+
+    def wake(self):
+        if self.sleepers:
+            with self.idle: self.idle.notify()
+
+    # Called from inside a task: schedule fn(*args) on this worker's deque
+    def fork(self, fn, *args) -> Task:
+        task = Task(fn, args)
+        index = getattr(self.local, 'index', None)
+        self.submit(0 if index is None else index, task)
+        self.wake()
+        return task
+
+    # Wait for a forked task, running other tasks meanwhile
+    def join(self, task):
+        index = getattr(self.local, 'index', None)
+        while not task.done:
+            if index is None:
+                time.sleep(0.0001)
+                continue
+            other = self.findTask(index)
+            if other is not None: other.run()
+            else: time.sleep(0)
+        if task.error is not None: raise task.error
+        return task.result
+
+    # Run a root task from outside the pool and return its result
+    def run(self, fn, *args):
+        if self.mode != 'thread': raise RuntimeError('run() needs a thread pool; use map() in process mode')
+        if not self.running: raise RuntimeError('Scheduler is shut down')
+        return self.join(self.fork(fn, *args))
+
+    # [fn(x) for x in items] in parallel, 'grain' items per task
+    def map(self, fn, items, grain=1) -> list:
+        items = list(items)
+        if self.mode == 'process': return mapProcesses(fn, items, self.workers, grain)
+        chunk = lambda lo, hi: [fn(x) for x in items[lo:hi]]
+        def split(lo, hi):
+            if hi - lo <= grain: return chunk(lo, hi)
+            mid = (lo + hi) // 2
+            right = self.fork(split, mid, hi)
+            left = split(lo, mid)
+            return left + self.join(right)
+        return self.run(split, 0, len(items)) if items else []
+
+    def stats(self) -> dict:
+        return {'workers': self.workers, 'steals': [d.steals for d in self.deques] if self.threads else []}
+
+    def shutdown(self):
+        self.running = False
+        with self.idle: self.idle.notify_all()
+        for t in self.threads: t.join()
+        self.threads = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+class SharedRangeDeque:
+    # Work-stealing deques of index ranges in shared memory, one per worker
+    # process. Worker i owns [lo, hi): it takes 'grain' indices at a time from
+    # lo, and a thief takes the upper half of the victim's remaining range.
+    # Each range has its own lock, so owners only contend with thieves.
+
+    def __init__(self, workers, n, ctx):
+        self.workers = workers
+        self.bounds = ctx.Array('q', 2 * workers, lock=False)  # lo, hi per worker
+        self.locks = [ctx.Lock() for _ in range(workers)]
+        # Deal out contiguous ranges to start with
+        for i in range(workers):
+            self.bounds[2 * i] = n * i // workers
+            self.bounds[2 * i + 1] = n * (i + 1) // workers
+
+    # owner: take up to 'grain' indices from the bottom of our range; (lo, hi) or None
+    def take(self, index, grain):
+        with self.locks[index]:
+            lo, hi = self.bounds[2 * index], self.bounds[2 * index + 1]
+            if lo >= hi: return None
+            end = min(lo + grain, hi)
+            self.bounds[2 * index] = end
+            return lo, end
+
+    # thief: move the top half of a victim's range into our own; True on success
+    def steal(self, index, victim) -> bool:
+        with self.locks[victim]:
+            lo, hi = self.bounds[2 * victim], self.bounds[2 * victim + 1]
+            if lo >= hi: return False
+            mid = hi - (hi - lo + 1) // 2
+            self.bounds[2 * victim + 1] = mid
+        with self.locks[index]:
+            self.bounds[2 * index], self.bounds[2 * index + 1] = mid, hi
+        return True
+
+
+# [fn(x) for x in items] on forked worker processes. fn and items are inherited
+# through fork rather than pickled; only results travel back through a pipe.
+# If fn raises in a worker, the remaining workers are stopped and the
+# exception is re-raised here.
+def mapProcesses(fn, items, workers, grain=1) -> list:
+    ctx = mp.get_context('fork')
+    ranges = SharedRangeDeque(workers, len(items), ctx)
+
+    def work(index, conn):
+        try:
+            results = []
+            while True:
+                span = ranges.take(index, grain)
+                if span is None:
+                    offset = random.randrange(workers)
+                    if not any(ranges.steal(index, (offset + k) % workers)
+                               for k in range(workers) if (offset + k) % workers != index):
+                        break
+                    continue
+                lo, hi = span
+                results.append((lo, [fn(x) for x in items[lo:hi]]))
+        except BaseException as e:
+            try:
+                conn.send(('error', e))
+            except Exception:
+                # The exception itself may not pickle
+                conn.send(('error', RuntimeError(repr(e))))
+        else:
+            conn.send(('ok', results))
+        finally:
+            conn.close()
+
+    pipes = [ctx.Pipe(duplex=False) for _ in range(workers)]
+    procs = [ctx.Process(target=work, args=(i, pipes[i][1])) for i in range(workers)]
+    for p in procs: p.start()
+    # Drop our copies of the write ends, so a dead worker's pipe reports EOF
+    for _, send in pipes: send.close()
+
+    out = [None] * len(items)
+    try:
+        for i, (recv, _) in enumerate(pipes):
+            try:
+                status, payload = recv.recv()
+            except EOFError:
+                procs[i].join()
+                raise RuntimeError(f'Worker {i} exited with code {procs[i].exitcode} without sending results') from None
+            if status == 'error': raise payload
+            for lo, chunk in payload:
+                out[lo:lo + len(chunk)] = chunk
+    except BaseException:
+        for p in procs:
+            if p.is_alive(): p.terminate()
+        raise
+    finally:
+        for p in procs: p.join()
+        for recv, _ in pipes: recv.close()
+    for i, p in enumerate(procs):
+        if p.exitcode != 0: raise RuntimeError(f'Worker {i} exited with code {p.exitcode}')
+    return out
+
+# testing
+def main():
+    d = WorkStealingDeque()
+    for i in range(5): d.push(i)
+    print(d, "Size:", d.size())
+    print("owner pops", d.pop(), "thief steals", d.steal(), d)
+    print("popOr on empty:", WorkStealingDeque().popOr('nothing'))
+
+    def fib(n):
+        if n < 2: return n
+        right = s.fork(fib, n - 2)
+        return fib(n - 1) + s.join(right)
+
+    with Scheduler(workers=4) as s:
+        print("fib(18) =", s.run(fib, 18), "steals per worker:", s.stats()['steals'])
+        print("map squares:", s.map(lambda x: x * x, range(10), grain=3))
+        try:
+            s.run(lambda: 1 // 0)
+        except ZeroDivisionError as e:
+            print("Error from task:", e)
+
+    s = Scheduler(workers=3, mode='process')
+    print("process map:", s.map(lambda x: x * x, range(10), grain=2))
+    def failAtSeven(x):
+        if x == 7: raise ValueError(f'bad item {x}')
+        return x
+    try:
+        s.map(failAtSeven, range(10))
+    except ValueError as e:
+        print("Error from worker process:", e)
+
+
+# Baseline for the benchmark: the same fork/join on a single shared Queue.
+# A joining worker helps with the oldest queued task, typically a large one,
+# so call nesting grows with the task count; keep its workloads coarse.
+class SharedQueueScheduler(Scheduler):
+
+    def setupDeques(self):
+        from queue import Queue
+        self.deques = []
+        self.shared = Queue(max_size=None, policy=Queue.BLOCK)     # BLOCK makes poll() lock
+
+    def submit(self, index, task):
+        self.shared.offer(task)
+
+    def findTask(self, index):
+        try:
+            return self.shared.poll()
+        except RuntimeError:
+            return None
+
+
+# benchmark: parallel recursive mergesort, work stealing vs one shared Queue
+def benchmark(n: int = 200_000, workers=(1, 2, 4), cutoff=2_000):
+    def mergesort(s, xs):
+        if len(xs) <= cutoff: return sorted(xs)
+        mid = len(xs) // 2
+        right = s.fork(mergesort, s, xs[mid:])
+        left = mergesort(s, xs[:mid])
+        right = s.join(right)
+        out, i, j = [], 0, 0
+        while i < len(left) and j < len(right):
+            if left[i] <= right[j]: out.append(left[i]); i += 1
+            else: out.append(right[j]); j += 1
+        return out + left[i:] + right[j:]
+
+    xs = [random.random() for _ in range(n)]
+    expected = sorted(xs)
+    print(f"{'workers':>8}{'work stealing':>15}{'shared Queue':>14}")
+    for k in workers:
+        times = []
+        for cls in (Scheduler, SharedQueueScheduler):
+            with cls(workers=k) as s:
+                start = time.perf_counter()
+                assert s.run(mergesort, s, xs) == expected
+                times.append(time.perf_counter() - start)
+        print(f"{k:>8}{times[0]:>14.3f}s{times[1]:>13.3f}s")
+
+    # CPU-bound leaves only scale past the GIL on processes
+    work = lambda x: sum(i * i for i in range(x))
+    sizes = [random.randrange(1_000, 20_000) for _ in range(400)]
+    start = time.perf_counter()
+    [work(x) for x in sizes]
+    print(f"sequential map: {time.perf_counter() - start:.3f}s")
+    for k in workers:
+        start = time.perf_counter()
+        Scheduler(workers=k, mode='process').map(work, sizes, grain=8)
+        print(f"process map, {k} workers: {time.perf_counter() - start:.3f}s")
+
+if __name__ == "__main__":
+    main()
+    benchmark()
@@ -0,0 +1,221 @@
+class IndexedPriorityQueue:
+    # Min-heap of (key, priority) pairs that also knows where every key sits.
+    # 'keys' and 'prios' are the heap, stored as parallel lists; 'pos' maps each
+    # key to its heap index. Every swap updates 'pos', so a key is found in O(1)
+    # and changing or removing its priority is a single O(log(n)) swim or sink.
+
+    def __init__(self, items=None): # items: iterable of (key, priority)
+        self.keys = []
+        self.prios = []
+        self.pos = {}
+        if items is not None:
+            for key, priority in items:
+                if key in self.pos: raise ValueError(f'Duplicate key {key!r}')
+                self.pos[key] = len(self.keys)
+                self.keys.append(key)
+                self.prios.append(priority)
+
+            # Heapify process, O(n)
+            for i in range(len(self.keys) // 2 - 1, -1, -1):
+                self.sink(i)
+        return
+
+    def size(self) -> int: # O(1)
+        return len(self.keys)
+
+    def isEmpty(self) -> bool: # O(1)
+        return len(self.keys) == 0
+
+    def clear(self):
+        self.keys.clear()
+        self.prios.clear()
+        self.pos.clear()
+
+    # Test if key is present, O(1)
+    def contains(self, key) -> bool:
+        return key in self.pos
+
+    # Current priority of key, O(1)
+    def priorityOf(self, key):
+        return self.prios[self.indexOf(key)]
+
+    def indexOf(self, key) -> int:
+        try:
+            return self.pos[key]
+        except KeyError:
+            raise KeyError(key) from None
+
+    # Smallest priority, O(1)
+    def peek(self):
+        if self.isEmpty(): return None
+        return self.prios[0]
+
+    # Key with the smallest priority, O(1)
+    def peekKey(self):
+        if self.isEmpty(): return None
+        return self.keys[0]
+
+    # Removes root of heap and returns its priority, O(log(n))
+    def poll(self):
+        if self.isEmpty(): return None
+        return self.removeAt(0)[1]
+
+    # Removes root of heap and returns (key, priority), O(log(n))
+    def pollWithKey(self):
+        if self.isEmpty(): return None
+        return self.removeAt(0)
+
+    # add a new key, O(log(n))
+    def insert(self, key, priority):
+        if priority is None: raise ValueError('Cannot add NoneType to heap')
+        if key in self.pos: raise ValueError(f'Key {key!r} is already in the queue')
+        self.pos[key] = len(self.keys)
+        self.keys.append(key)
+        self.prios.append(priority)
+        self.swim(len(self.keys) - 1)
+
+    # lower the priority of key, O(log(n))
+    def decreaseKey(self, key, priority):
+        i = self.indexOf(key)
+        if self.prios[i] < priority: raise ValueError('New priority is larger than the current one')
+        self.prios[i] = priority
+        self.swim(i)
+
+    # raise the priority of key, O(log(n))
+    def increaseKey(self, key, priority):
+        i = self.indexOf(key)
+        if priority < self.prios[i]: raise ValueError('New priority is smaller than the current one')
+        self.prios[i] = priority
+        self.sink(i)
+
+    # set the priority of key in either direction, inserting it if absent, O(log(n))
+    def update(self, key, priority):
+        if priority is None: raise ValueError('Cannot add NoneType to heap')
+        i = self.pos.get(key)
+        if i is None:
+            self.insert(key, priority)
+            return
+        old = self.prios[i]
+        self.prios[i] = priority
+        if priority < old: self.swim(i)
+        else: self.sink(i)
+
+    # remove key and return its priority, O(log(n))
+    def removeKey(self, key):
+        return self.removeAt(self.indexOf(key))[1]
+
+    # Test if priority at node i < node j, O(1)
+    def less(self, i: int, j: int) -> bool:
+        return self.prios[i] < self.prios[j]
+
+    # Swap two nodes and their recorded positions, O(1)
+    def swap(self, i, j):
+        keys, prios, pos = self.keys, self.prios, self.pos
+        keys[i], keys[j] = keys[j], keys[i]
+        prios[i], prios[j] = prios[j], prios[i]
+        pos[keys[i]] = i
+        pos[keys[j]] = j
+
+    # Perform bottom-up node swim, O(log(n))
+    def swim(self, k):
+        parent = (k - 1) // 2
+        while k > 0 and self.less(k, parent):
+            self.swap(parent, k)
+            k = parent
+            parent = (k - 1) // 2
+
+    # Top-down node sink, O(log(n))
+    def sink(self, k):
+        heapSize = len(self.keys)
+        while True:
+            left = 2 * k + 1
+            right = left + 1
+            if left >= heapSize: break
+            smallest = right if right < heapSize and self.less(right, left) else left
+            if not self.less(smallest, k): break
+            self.swap(smallest, k)
+            k = smallest
+
+    # Removes the node at index i and returns (key, priority), O(log(n))
+    def removeAt(self, i):
+        last = len(self.keys) - 1
+        self.swap(i, last)
+        key = self.keys.pop()
+        priority = self.prios.pop()
+        del self.pos[key]
+        if i != last:
+            # The moved node may belong above or below i
+            self.sink(i)
+            self.swim(i)
+        return key, priority
+
+    def __str__(self):
+        return '[' + ', '.join(f'{k}: {p}' for k, p in zip(self.keys, self.prios)) + ']'
+
+
+# Testing
+def main():
+    print("=== Creating indexed heap ===")
+    pq = IndexedPriorityQueue([('a', 5), ('b', 3), ('c', 8), ('d', 1)])
+    print("Heap:", pq)
+    print("Peek:", pq.peek(), "key", pq.peekKey(), "| Size:", pq.size())
+    print("Contains 'c'?", pq.contains('c'), "| Contains 'z'?", pq.contains('z'))
+    print()
+
+    print("=== Reprioritizing ===")
+    pq.insert('e', 4)
+    pq.decreaseKey('c', 0)
+    print("After insert e=4, decreaseKey c=0:", pq)
+    pq.increaseKey('d', 9)
+    pq.update('a', 2)
+    pq.update('f', 6)
+    print("After increaseKey d=9, update a=2, update (insert) f=6:", pq)
+    print("Priority of 'd':", pq.priorityOf('d'))
+    print("removeKey('e') ->", pq.removeKey('e'), pq)
+    print()
+
+    print("=== Polling (ascending) ===")
+    while not pq.isEmpty():
+        print("Polled:", pq.pollWithKey())
+    print()
+
+    print("=== Error cases ===")
+    pq.insert('x', 1)
+    for bad in (lambda: pq.insert('x', 2), lambda: pq.decreaseKey('x', 5), lambda: pq.removeKey('y')):
+        try:
+            bad()
+        except (ValueError, KeyError) as e:
+            print(type(e).__name__, e)
+
+
+# benchmark: reprioritizing keys vs remove + add on the list-backed BinaryHeap
+def benchmark(sizes=(1_000, 10_000, 100_000), updates: int = 500):
+    import random
+    import time
+    from priorityqueueDirect import BinaryHeap
+
+    print(f"{'n':>9}{'BinaryHeap':>13}{'Indexed':>11}{'speedup':>9}")
+    for n in sizes:
+        prios = [random.random() for _ in range(n)]
+        changes = [(random.randrange(n), random.random()) for _ in range(updates)]
+
+        h = BinaryHeap([(p, k) for k, p in enumerate(prios)])
+        current = list(prios)
+        start = time.perf_counter()
+        for k, p in changes:
+            h.remove((current[k], k))
+            h.add((p, k))
+            current[k] = p
+        slow = time.perf_counter() - start
+
+        pq = IndexedPriorityQueue(enumerate(prios))
+        start = time.perf_counter()
+        for k, p in changes: pq.update(k, p)
+        fast = time.perf_counter() - start
+
+        assert [pq.pollWithKey()[0] for _ in range(10)] == [h.poll()[1] for _ in range(10)]
+        print(f"{n:>9,}{slow:>12.4f}s{fast:>10.4f}s{slow / fast:>8.0f}x")
+
+if __name__ == "__main__":
+    main()
+    benchmark()
@@ -18,16 +18,80 @@ merge(*iterables, key=None)	        O(N log K) where N is the total elements and
 '''
 class BinaryHeap:
 
+    # lazy=True turns remove() into an O(1) tombstone: the element stays in the
+    # list and is skipped when it reaches the top. Elements must be hashable.
+    # 'live' and 'dead' count copies of each element, so size() and contains()
+    # stay exact; once tombstones exceed 'compact_ratio' of the list, it is
+    # rebuilt without them in O(n).
+    #
+    # key=f orders elements by f(elem), computed once per add and stored as a
+    # (key, seq, elem) entry; seq counts insertions, so equal keys come out
+    # first-in first-out and the elements themselves are never compared.
+    # max_heap=True pops the largest first through heapq's '_max' functions,
+    # so nothing has to be negated.
+    def __init__(self, data=None, lazy=False, compact_ratio=0.5, key=None, max_heap=False): #data expected to be a list
+        self.key = key
+        self.max_heap = max_heap
+        self.seq = 0
+        if max_heap:
+            self.heapifyList, self.popEntry = heapq._heapify_max, heapq._heappop_max
+        else:
+            self.heapifyList, self.popEntry = heapq.heapify, heapq.heappop
 
-    def __init__(self, data=None): #data expected to be a list
         if data is not None:
-            self.heap = data
-            heapq.heapify(self.heap)
+            self.heap = data if key is None else [self.decorate(elem) for elem in data]
+            self.heapifyList(self.heap)
         else:
             self.heap = []
+
+        self.lazy = lazy
+        if lazy:
+            if not 0 < compact_ratio <= 1: raise ValueError('compact_ratio must be in (0, 1]')
+            self.compact_ratio = compact_ratio
+            self.live = {}          # elem -> copies still in the heap
+            self.dead = {}          # elem -> copies removed but not yet popped
+            self.tombstones = 0
+            for entry in self.heap:
+                elem = self.elemOf(entry)
+                self.live[elem] = self.live.get(elem, 0) + 1
         return
 
+    # (key, seq, elem) entry for keyed heaps; a max-heap negates seq so that
+    # the earlier of two equal keys still counts as the larger entry
+    def decorate(self, elem):
+        seq = self.seq
+        self.seq += 1
+        return (self.key(elem), -seq if self.max_heap else seq, elem)
+
+    def elemOf(self, entry):
+        return entry if self.key is None else entry[2]
+
+    # Push an entry; if comparing it raises, take it back out so the heap is
+    # left as it was
+    def pushEntry(self, entry):
+        heap = self.heap
+        try:
+            if self.max_heap:
+                # Sift up by swapping, so the entry stays in the list on failure
+                heap.append(entry)
+                pos = len(heap) - 1
+                while pos > 0:
+                    parent = (pos - 1) >> 1
+                    if not heap[parent] < heap[pos]: break
+                    heap[parent], heap[pos] = heap[pos], heap[parent]
+                    pos = parent
+            else:
+                heapq.heappush(heap, entry)
+        except BaseException:
+            for i in range(len(heap) - 1, -1, -1):
+                if heap[i] is entry:
+                    heap.pop(i)
+                    self.heapifyList(heap)
+                    break
+            raise
+
     def size(self) -> int:
+        if self.lazy: return len(self.heap) - self.tombstones
         return len(self.heap)
     
     def isEmpty(self) -> bool:
@@ -35,16 +99,27 @@ class BinaryHeap:
     
     def clear(self):
         self.heap.clear()
+        if self.lazy:
+            self.live.clear()
+            self.dead.clear()
+            self.tombstones = 0
 
     def peek(self):
-        return self.heap[0]
+        if self.lazy: self.prune()
+        return self.elemOf(self.heap[0])
     
     def poll(self):
-        return heapq.heappop(self.heap)
+        if not self.lazy: return self.elemOf(self.popEntry(self.heap))
+        self.prune()
+        elem = self.elemOf(self.popEntry(self.heap))
+        self.forget(self.live, elem)
+        return elem
     
     def contains(self, elem):
+        if self.lazy: return self.live.get(elem, 0) > 0
+
         for data in self.heap:
-            if data == elem:
+            if self.elemOf(data) == elem:
                 return True
             
         return False
@@ -52,22 +127,66 @@ class BinaryHeap:
     def add(self, elem):
         if elem is None: raise ValueError('cannot insert NoneType into Heap')
 
-        heapq.heappush(self.heap, elem)
+        # Count the live copy first: it also rejects unhashable elems before
+        # they reach the heap
+        if self.lazy: self.live[elem] = self.live.get(elem, 0) + 1
+        try:
+            self.pushEntry(elem if self.key is None else self.decorate(elem))
+        except BaseException:
+            if self.lazy: self.forget(self.live, elem)
+            raise
 
     def remove(self, elem) -> bool:
-        try:
-            self.heap.remove(elem)
-        except ValueError:
-            return False
-        else:
-            heapq.heapify(self.heap)
-            return True
+        if self.lazy: return self.bury(elem)
+        for i, data in enumerate(self.heap):
+            if self.elemOf(data) == elem:
+                self.heap.pop(i)
+                self.heapifyList(self.heap)
+                return True
+        return False
         
     def removeAt(self, index):
         if self.isEmpty(): return None
-        data = self.heap.pop(index)
-        heapq.heapify(self.heap)
+        # Indices only make sense once the tombstones are gone
+        if self.lazy: self.compact()
+        data = self.elemOf(self.heap.pop(index))
+        self.heapifyList(self.heap)
+        if self.lazy: self.forget(self.live, data)
         return data
+
+    # Lazy mode: mark one live copy of elem as dead, O(1) amortized
+    def bury(self, elem) -> bool:
+        if not self.live.get(elem): return False
+        self.forget(self.live, elem)
+        self.dead[elem] = self.dead.get(elem, 0) + 1
+        self.tombstones += 1
+        if self.tombstones > self.compact_ratio * len(self.heap): self.compact()
+        return True
+
+    # Lazy mode: pop tombstones off the top until a live element is there
+    def prune(self):
+        heap, dead = self.heap, self.dead
+        while heap and self.elemOf(heap[0]) in dead:
+            self.forget(dead, self.elemOf(self.popEntry(heap)))
+            self.tombstones -= 1
+
+    # Lazy mode: drop every tombstone and re-heapify, O(n)
+    def compact(self):
+        if not self.tombstones: return
+        dead = self.dead
+        kept = []
+        for entry in self.heap:
+            elem = self.elemOf(entry)
+            if elem in dead: self.forget(dead, elem)
+            else: kept.append(entry)
+        self.heap[:] = kept
+        self.heapifyList(self.heap)
+        self.tombstones = 0
+
+    # decrement a copy count, deleting the entry at zero
+    def forget(self, counts, elem):
+        if counts[elem] == 1: del counts[elem]
+        else: counts[elem] -= 1
     
 
 # Testing code
@@ -128,13 +247,95 @@ def main():
     print("Heap:", h.heap)
     print("Empty?", h.isEmpty())
 
+    print()
+
+    print("Lazy deletion: cancelling timers")
+    h = BinaryHeap([30, 10, 50, 20, 40, 10], lazy=True, compact_ratio=0.5)
+    print("Removed 10?", h.remove(10), "| Removed 20?", h.remove(20), "| Removed 99?", h.remove(99))
+    print("Heap (tombstones still inside):", h.heap, "| Size:", h.size())
+    print("Contains 10?", h.contains(10), "| Contains 20?", h.contains(20))
+    print("Peek:", h.peek(), "| Heap after skipping dead top:", h.heap)
+    h.remove(30)
+    h.remove(40)
+    print("After two more removes the heap compacts:", h.heap, "| Size:", h.size())
+    print("Polled:", [h.poll() for _ in range(h.size())], "| Empty?", h.isEmpty())
+
+    print()
+
+    print("Key function and max-heap")
+    tasks = [('write', 2), ('test', 1), ('ship', 3), ('review', 2), ('lint', 1)]
+    h = BinaryHeap(list(tasks), key=lambda t: t[1])
+    print("By priority, ties first-in first-out:", [h.poll() for _ in range(h.size())])
+    h = BinaryHeap(list(tasks), key=lambda t: t[1], max_heap=True)
+    print("Highest priority first:", [h.poll() for _ in range(h.size())])
+    h = BinaryHeap(['pear', 'fig', 'apple'], max_heap=True)
+    h.add('kiwi')
+    print("Max-heap of strings, no negation:", [h.poll() for _ in range(h.size())])
+
     # Uncomment to test error cases
     # h.peek()          # IndexError on empty heap
     # h.poll()          # IndexError on empty heap
     # h.add(None)       # ValueError
 
+
+# benchmark: a timer wheel where most timers are cancelled before they fire
+def benchmark(n: int = 10_000, cancel: float = 0.8, ratios=(0.25, 0.5, 1.0)):
+    import random
+    import time
+
+    deadlines = random.sample(range(n * 10), n)
+    cancelled = random.sample(deadlines, int(n * cancel))
+
+    def run(h):
+        start = time.perf_counter()
+        for t in deadlines: h.add(t)
+        for t in cancelled: h.remove(t)
+        fired = [h.poll() for _ in range(h.size())]
+        return time.perf_counter() - start, fired
+
+    eager, expected = run(BinaryHeap())
+    print(f"{n:,} timers, {cancel:.0%} cancelled")
+    print(f"{'mode':<24}{'time':>10}")
+    print(f"{'eager remove':<24}{eager:>9.3f}s")
+    for ratio in ratios:
+        elapsed, fired = run(BinaryHeap(lazy=True, compact_ratio=ratio))
+        assert fired == expected
+        print(f"{f'lazy, compact at {ratio:.0%}':<24}{elapsed:>9.3f}s")
+
+# benchmark: key=/max_heap= against decorating tuples by hand
+def benchmarkKeys(n: int = 200_000):
+    import random
+    import time
+    from itertools import count
+
+    items = [{'id': i, 'deadline': random.randrange(n)} for i in range(n)]
+    key = lambda item: item['deadline']
+
+    def timed(fn):
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+    def byHand(negate):
+        h, seq = BinaryHeap(), count()
+        sign = -1 if negate else 1
+        for item in items: h.add((sign * item['deadline'], next(seq), item))
+        while not h.isEmpty(): h.poll()[2]
+
+    def native(max_heap):
+        h = BinaryHeap(key=key, max_heap=max_heap)
+        for item in items: h.add(item)
+        while not h.isEmpty(): h.poll()
+
+    print(f"{n:,} pushes then {n:,} polls")
+    print(f"{'':<10}{'(key, seq, item) by hand':>26}{'key=':>10}")
+    print(f"{'min-heap':<10}{timed(lambda: byHand(False)):>25.3f}s{timed(lambda: native(False)):>9.3f}s")
+    print(f"{'max-heap':<10}{timed(lambda: byHand(True)):>25.3f}s{timed(lambda: native(True)):>9.3f}s")
+
 if __name__ == "__main__":
     main()
+    benchmark()
+    benchmarkKeys()
 
 
     
@@ -1,12 +1,36 @@
 class BinaryHeapManual:
 
-    def __init__(self, elems=None):
+    # 'arity' is the number of children per node: a d-ary heap is only
+    # log_d(n) levels deep, so swim is cheaper and sink compares more children
+    # per level, over nodes that sit next to each other in the list
+    #
+    # key=f orders elements by f(elem) and max_heap=True puts the largest on
+    # top. Keys are computed once per add and kept in 'keys', a list parallel
+    # to 'heap', with insertion numbers in 'order' so equal keys come out
+    # first-in first-out; no per-element tuple is built.
+    def __init__(self, elems=None, arity=2, key=None, max_heap=False):
+        if arity < 2: raise ValueError('arity must be at least 2')
+        self.arity = arity
+        self.key = key
+        self.max_heap = max_heap
+        self.keyed = key is not None or max_heap
+        if self.keyed:
+            self.keys = []
+            self.order = []
+            self.seq = 0
+            # swap the plain comparisons for the keyed ones
+            self.less = self.lessKeyed
+            self.swap = self.swapKeyed
         if elems is not None:
             self.heap = elems
             heapSize = len(self.heap)
+            if self.keyed:
+                self.keys = list(map(key, elems)) if key is not None else list(elems)
+                self.order = list(range(heapSize))
+                self.seq = heapSize
 
-            # Heapify process, O(n)
-            for i in range(max(0, heapSize//2 - 1), -1, -1):
+            # Heapify process, O(n); the last parent is the parent of the last node
+            for i in range(max(0, (heapSize - 2) // arity), -1, -1):
                 self.sink(i)
         else:
             self.heap = []
@@ -16,6 +40,9 @@ class BinaryHeapManual:
     
     def clear(self):
         self.heap.clear()
+        if self.keyed:
+            self.keys.clear()
+            self.order.clear()
 
     def size(self) -> int: # O(1)
         return len(self.heap)
@@ -39,39 +66,54 @@ class BinaryHeapManual:
     def add(self, elem):
         if elem is None: raise ValueError('Cannot add NoneType to heap')
 
+        if self.keyed:
+            # Compute the key before touching any list, so a failing key
+            # function leaves the heap as it was
+            k = self.key(elem) if self.key is not None else elem
+            self.keys.append(k)
+            self.order.append(self.seq)
+            self.seq += 1
         self.heap.append(elem)
         self.swim(self.size() - 1)
 
     # Test if value at node i <= node j, O(1); assumes i and j are valid indices
     def less(self, i:int, j:int) -> bool:
         return self.heap[i] <= self.heap[j]
+
+    # Keyed version of less: compare keys (reversed for a max-heap), then insertion order
+    def lessKeyed(self, i:int, j:int) -> bool:
+        ki = self.keys[i]
+        kj = self.keys[j]
+        if ki == kj: return self.order[i] <= self.order[j]
+        return kj < ki if self.max_heap else ki < kj
     
     # Perform bottom-up node swim, O(log(n))
     def swim(self, k):
 
         # Grab index of parent of k-th node
-        parent = (k-1)//2
+        d = self.arity
+        parent = (k-1)//d
 
         # Keep swimming while we havent reached root and while we are less than parent
         while k>0 and self.less(k, parent):
             self.swap(parent, k)    # exchange k with parent
             k = parent              
-            parent = (k-1)//2       # find index of next parent node wrt. k
+            parent = (k-1)//d       # find index of next parent node wrt. k
         
-    # Top-down node sink, O(log(n))
+    # Top-down node sink, O(d * log_d(n))
     def sink(self, k):
         heapSize = self.size()
+        d = self.arity
         while True:
-            left = 2 * k + 1    # left node
-            right = 2 * k + 2   # right node
-            smallest = left     # assume left node is the smallest of the two children
+            first = d * k + 1   # children of k are first .. first + d - 1
+            smallest = first    # assume first child is the smallest of the children
 
-            # which is actually smaller, L or R? If R, update accordingly
-            # if R is Out-Of-Bounds then the second condition wont be checked for
-            if right < heapSize and self.less(right, left): smallest = right
+            # find the smallest of the children that exist
+            for child in range(first + 1, min(first + d, heapSize)):
+                if self.less(child, smallest): smallest = child
 
             # if we are outside the bounds of tree, or if we cannot sink anymore, stop earlu
-            if left >= heapSize or self.less(k, smallest): break
+            if first >= heapSize or self.less(k, smallest): break
 
             # move down the tree following the smallest node
             self.swap(smallest, k)
@@ -83,6 +125,13 @@ class BinaryHeapManual:
 
         self.heap[i] = e_j
         self.heap[j] = e_i
+
+    # Keyed version of swap: keys and insertion order move with their element
+    def swapKeyed(self, i, j):
+        heap, keys, order = self.heap, self.keys, self.order
+        heap[i], heap[j] = heap[j], heap[i]
+        keys[i], keys[j] = keys[j], keys[i]
+        order[i], order[j] = order[j], order[i]
     
     # Removes a particular element in the heap, O(n)
     def remove(self, elem):
@@ -103,6 +152,9 @@ class BinaryHeapManual:
 
         # Obliterate the value
         self.heap.pop()
+        if self.keyed:
+            self.keys.pop()
+            self.order.pop()
 
         if i == index_last: return removed_data
         elem = self.heap[i]
@@ -162,9 +214,80 @@ def main():
     heap3.clear()
     print("Heap3 after clear:", heap3.heap)
     print("Is empty?", heap3.isEmpty())
+    print()
+
+    print("=== 4-ary heap ===")
+    heap4 = BinaryHeapManual([9, 3, 6, 2, 8, 5, 1, 7, 4, 0], arity=4)
+    print("Heap4 initial:", heap4.heap)
+    heap4.removeAt(3)
+    heap4.add(-1)
+    print("After removeAt(3) and add(-1):", heap4.heap)
+    print("Polled in order:", [heap4.poll() for _ in range(heap4.size())])
+    print()
+
+    print("=== Key function and max-heap ===")
+    tasks = [('write', 2), ('test', 1), ('ship', 3), ('review', 2), ('lint', 1)]
+    heap5 = BinaryHeapManual(list(tasks), key=lambda t: t[1])
+    print("By priority, ties first-in first-out:", [heap5.poll() for _ in range(heap5.size())])
+    heap6 = BinaryHeapManual(list(tasks), key=lambda t: t[1], max_heap=True, arity=4)
+    print("Highest priority first (4-ary):", [heap6.poll() for _ in range(heap6.size())])
+    heap7 = BinaryHeapManual(['pear', 'fig', 'apple'], max_heap=True)
+    heap7.add('kiwi')
+    print("Max-heap of strings, no negation:", [heap7.poll() for _ in range(heap7.size())])
+
+
+# benchmark: ops/sec for each arity and push:poll ratio, starting from n elements
+def benchmark(n: int = 20_000, ops: int = 60_000, arities=(2, 3, 4, 8, 16), ratios=(1, 4, 16)):
+    import random
+    import time
+
+    base = [random.random() for _ in range(n)]
+    values = [random.random() for _ in range(ops)]
+    print(f"{'arity':>6}" + ''.join(f"{f'{r}:1 push:poll':>16}" for r in ratios))
+    for d in arities:
+        row = f"{d:>6}"
+        for r in ratios:
+            heap = BinaryHeapManual(list(base), arity=d)
+            start = time.perf_counter()
+            for i, x in enumerate(values):
+                if i % (r + 1) == r: heap.poll()
+                else: heap.add(x)
+            row += f"{ops / (time.perf_counter() - start):>16,.0f}"
+        print(row)
+    print("(ops/sec)")
+
+
+# benchmark: key=/max_heap= against decorating tuples by hand
+def benchmarkKeys(n: int = 50_000):
+    import random
+    import time
+
+    items = [{'id': i, 'deadline': random.randrange(n)} for i in range(n)]
+
+    def timed(fn):
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+    def byHand(negate):
+        heap = BinaryHeapManual()
+        sign = -1 if negate else 1
+        for seq, item in enumerate(items): heap.add((sign * item['deadline'], seq, item))
+        while not heap.isEmpty(): heap.poll()[2]
+
+    def native(max_heap):
+        heap = BinaryHeapManual(key=lambda item: item['deadline'], max_heap=max_heap)
+        for item in items: heap.add(item)
+        while not heap.isEmpty(): heap.poll()
 
+    print(f"{n:,} pushes then {n:,} polls")
+    print(f"{'':<10}{'(key, seq, item) by hand':>26}{'key=':>10}")
+    print(f"{'min-heap':<10}{timed(lambda: byHand(False)):>25.3f}s{timed(lambda: native(False)):>9.3f}s")
+    print(f"{'max-heap':<10}{timed(lambda: byHand(True)):>25.3f}s{timed(lambda: native(True)):>9.3f}s")
 
 if __name__ == "__main__":
     main()
+    benchmark()
+    benchmarkKeys()
 
 
@@ -0,0 +1,278 @@
+import random
+
+class ImplicitTreap:
+    # A sequence stored in a treap keyed implicitly by position: a node's index
+    # is the size of everything to its left, so there are no keys to keep up to
+    # date. Random heap-ordered priorities keep the expected depth O(log(n)).
+    class Node:
+        def __init__(self, value):
+            # The value/data contained within the node.
+            self.value = value
+            # Random heap priority, parents always have the larger one.
+            self.priority = random.random()
+            # Number of nodes in the subtree rooted here.
+            self.size = 1
+            # The left and the right children of this node.
+            self.left = None
+            self.right = None
+        def __str__(self):
+            return str(self.value)
+
+    def __init__(self, data=None):
+        # The root node of the treap.
+        self.root = None
+        if data is not None: self.root = self.build(data)
+
+    # Build the treap from an iterable in order, O(n). Nodes are added along the
+    # right spine with a stack, like a Cartesian tree over their priorities.
+    def build(self, data) -> Node:
+        stack = []
+        for value in data:
+            node = ImplicitTreap.Node(value)
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+                self.update(last)
+            node.left = last
+            if stack: stack[-1].right = node
+            stack.append(node)
+        last = None
+        while stack:
+            last = stack.pop()
+            self.update(last)
+        return last
+
+    # Size of a possibly empty subtree.
+    def sizeOf(self, node:Node) -> int:
+        return 0 if node is None else node.size
+
+    # Recompute a node's subtree size from its children.
+    def update(self, node:Node):
+        node.size = 1 + self.sizeOf(node.left) + self.sizeOf(node.right)
+
+    # Split a subtree into its first 'k' nodes and the rest, O(log(n)).
+    def splitNode(self, node:Node, k:int):
+        if node is None: return None, None
+        if self.sizeOf(node.left) < k:
+            left, right = self.splitNode(node.right, k - self.sizeOf(node.left) - 1)
+            node.right = left
+            self.update(node)
+            return node, right
+        left, right = self.splitNode(node.left, k)
+        node.left = right
+        self.update(node)
+        return left, node
+
+    # Merge two subtrees where every node of 'a' comes before every node of 'b', O(log(n)).
+    def mergeNodes(self, a:Node, b:Node) -> Node:
+        if a is None: return b
+        if b is None: return a
+        if a.priority > b.priority:
+            a.right = self.mergeNodes(a.right, b)
+            self.update(a)
+            return a
+        b.left = self.mergeNodes(a, b.left)
+        self.update(b)
+        return b
+
+    # Returns the number of elements in the sequence.
+    def size(self) -> int:
+        return self.sizeOf(self.root)
+
+    # Returns whether or not the sequence is empty.
+    def isEmpty(self) -> bool:
+        return self.root is None
+
+    def __len__(self) -> int:
+        return self.size()
+
+    def clear(self):
+        self.root = None
+
+    # Find the node at a position, O(log(n)).
+    def nodeAt(self, index:int) -> Node:
+        if index < 0 or index >= self.size(): raise IndexError('Illegal Index')
+        node = self.root
+        while True:
+            left = self.sizeOf(node.left)
+            if index < left:
+                node = node.left
+            elif index > left:
+                index -= left + 1
+                node = node.right
+            else:
+                return node
+
+    # Value at a position, O(log(n)).
+    def get(self, index:int):
+        return self.nodeAt(index).value
+
+    # Replace the value at a position, O(log(n)).
+    def set(self, index:int, value):
+        self.nodeAt(index).value = value
+
+    # Insert a value so that it ends up at 'index', O(log(n)).
+    def insertAt(self, index:int, value):
+        if index < 0 or index > self.size(): raise IndexError('Illegal Index')
+        left, right = self.splitNode(self.root, index)
+        self.root = self.mergeNodes(self.mergeNodes(left, ImplicitTreap.Node(value)), right)
+
+    # Remove and return the value at 'index', O(log(n)).
+    def removeAt(self, index:int):
+        if index < 0 or index >= self.size(): raise IndexError('Illegal Index')
+        left, right = self.splitNode(self.root, index)
+        middle, right = self.splitNode(right, 1)
+        self.root = self.mergeNodes(left, right)
+        return middle.value
+
+    # Keep the first 'index' elements and return the rest as a new sequence, O(log(n)).
+    def split(self, index:int):
+        if index < 0 or index > self.size(): raise IndexError('Illegal Index')
+        rest = ImplicitTreap()
+        self.root, rest.root = self.splitNode(self.root, index)
+        return rest
+
+    # Append every element of 'other' to this sequence, O(log(n)). 'other' is left empty.
+    def concat(self, other):
+        if other is self: raise ValueError('Cannot concat a sequence onto itself')
+        self.root = self.mergeNodes(self.root, other.root)
+        other.root = None
+
+    # DoublyLinkedList-style ends of the sequence.
+    def add(self, value):
+        self.addLast(value)
+
+    def addLast(self, value):
+        self.root = self.mergeNodes(self.root, ImplicitTreap.Node(value))
+
+    def addFirst(self, value):
+        self.root = self.mergeNodes(ImplicitTreap.Node(value), self.root)
+
+    def peekFirst(self):
+        if self.isEmpty(): raise Exception('Empty sequence')
+        return self.get(0)
+
+    def peekLast(self):
+        if self.isEmpty(): raise Exception('Empty sequence')
+        return self.get(self.size() - 1)
+
+    def removeFirst(self):
+        if self.isEmpty(): raise Exception('Empty sequence')
+        return self.removeAt(0)
+
+    def removeLast(self):
+        if self.isEmpty(): raise Exception('Empty sequence')
+        return self.removeAt(self.size() - 1)
+
+    # In-order traversal with an explicit stack, O(n).
+    def __iter__(self):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+    def __reversed__(self):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            yield node.value
+            node = node.left
+
+    def __str__(self):
+        return '[' + ', '.join(map(str, self)) + ']'
+
+
+# testing
+def main():
+    def print_test(title):
+        print("\n" + "=" * 10, title, "=" * 10)
+
+    print_test("Bulk Build")
+    seq = ImplicitTreap(range(10))
+    print(seq, "size:", seq.size())
+
+    print_test("Positional Edits")
+    seq.insertAt(0, 'a')
+    seq.insertAt(5, 'b')
+    seq.insertAt(seq.size(), 'c')
+    print(seq)
+    print("get(5):", seq.get(5))
+    print("removeAt(5):", seq.removeAt(5))
+    seq.set(0, 'A')
+    print(seq)
+
+    print_test("Split / Concat")
+    rest = seq.split(4)
+    print("first:", seq, "rest:", rest)
+    rest.concat(seq)
+    print("rest + first:", rest, "first now empty?", seq.isEmpty())
+
+    print_test("Ends")
+    rest.addFirst('<')
+    rest.addLast('>')
+    print(rest.peekFirst(), rest.peekLast(), rest.removeFirst(), rest.removeLast())
+    print("Reversed:", list(reversed(rest)))
+
+    print_test("Random Edits Against list")
+    seq, ref = ImplicitTreap(), []
+    for i in range(2000):
+        if ref and random.random() < 0.4:
+            j = random.randrange(len(ref))
+            assert seq.removeAt(j) == ref.pop(j)
+        else:
+            j = random.randint(0, len(ref))
+            seq.insertAt(j, i)
+            ref.insert(j, i)
+    print("Matches list:", list(seq) == ref, "size:", seq.size())
+
+
+# benchmark: middle edits against DoublyLinkedList; pass sizes=(10**7,) for the largest case
+def benchmark(sizes=(10**5, 10**6), edits: int = 50):
+    import os
+    import sys
+    import time
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '01. linkedlist'))
+    from DoublyLinkedList import DoublyLinkedList
+
+    def middleEdits(seq, insert, remove):
+        start = time.perf_counter()
+        for i in range(edits):
+            index = random.randrange(len(seq))
+            insert(index, i)
+            remove(index)
+        return time.perf_counter() - start
+
+    print(f"{'n':>10}{'build DLL':>12}{'build treap':>13}{'edits DLL':>12}{'edits treap':>13}")
+    for n in sizes:
+        start = time.perf_counter()
+        dll = DoublyLinkedList()
+        dll.extend(range(n))
+        dll_build = time.perf_counter() - start
+        start = time.perf_counter()
+        seq = ImplicitTreap(range(n))
+        treap_build = time.perf_counter() - start
+
+        def dllInsert(index, value):
+            dll.finger = None       # random positions: measure the walk, not the finger cache
+            dll.addAt(index, value)
+        def dllRemove(index):
+            dll.finger = None
+            dll.removeAt(index)
+
+        dll_edits = middleEdits(dll, dllInsert, dllRemove)
+        treap_edits = middleEdits(seq, seq.insertAt, seq.removeAt)
+        print(f"{n:>10,}{dll_build:>11.3f}s{treap_build:>12.3f}s{dll_edits:>11.3f}s{treap_edits:>12.4f}s")
+
+
+if __name__ == "__main__":
+    main()
+    benchmark()